@@ -1,9 +1,23 @@
 import os
+import logging
+import codecs
+import re
+import shutil
+import subprocess
 import sys
+import threading
+import time
 import fnmatch # For gitignore style pattern matching
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import zstandard # Optional: compressed output files (pip install zstandard)
+except ImportError:
+    zstandard = None
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QFileDialog, QMessageBox, QGroupBox, QCheckBox, QScrollArea,
+    QPushButton, QFileDialog, QMessageBox, QGroupBox, QCheckBox,
     QRadioButton, QSpinBox, QStatusBar, QTabWidget, QProgressBar, QComboBox, QSplitter,
     QTextEdit, QTreeView, QFileSystemModel, QMainWindow, QAction, QToolBar,
     QFrame, QStyle, QStyleFactory, QMenu, QToolButton, QSizePolicy, QDialog,
@@ -12,6 +26,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont, QIcon, QColor, QPalette, QPixmap, QCursor
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QSettings, QTimer, QDir
 
+logger = logging.getLogger(__name__)
+
 # --- Configuration ---
 DEFAULT_EXCLUDE_DIRS = ['.git', 'node_modules', 'venv', '__pycache__', 'build', 'dist', '.svn', 'env', '.idea', '.vscode', 'target', 'out'] # Added target, out
 DEFAULT_EXCLUDE_FILES = ['package-lock.json', 'yarn.lock', '*.pyc', '*.pyo', '*.exe', '*.dll', '*.so', '*.dylib', '*.o', '*.a', '*.class', '*.jar'] # Added Java related
@@ -34,242 +50,546 @@ DEFAULT_EXCLUDE_EXTENSIONS = [
     '.bin', '.dat', '.cache', '.img', '.dmg', '.pkl', '.joblib'
 ]
 DEFAULT_MAX_LINES_PER_CHUNK = 15000
+DEFAULT_MAX_FILE_SIZE_MB = 5 # Larger files are truncated in the output (0 = no limit)
+PROGRESS_UPDATE_INTERVAL = 0.1 # Minimum seconds between worker progress signals
+
+# Shared look of the action buttons in the results section
+_RESULT_BUTTON_ICON_SIZE = QSize(24, 24)
+_RESULT_BUTTON_STYLE = """
+    QPushButton {
+        font-size: 14px;
+        font-weight: bold;
+        text-align: left;
+        padding-left: 15px;
+    }
+"""
+
+# Structure summary building blocks, shared instead of rebuilt for every item
+_INDENTS = tuple("  " * i for i in range(64))
+_DIR_ICON = "📁 "
+_FILE_ICON = "📄 "
+_FILE_MARKER = b">>>File: " # Starts every file block; chunks are split before these lines (inside a block only if it is too long)
+_MARKER_LINE = b"\n" + _FILE_MARKER # A marker at the start of a line, found in one C-level bytes.find
+_BLOCK_SEPARATOR = b"\n\n" + b"=" * 40 + b"\n"
+_OUTPUT_NEWLINE = os.linesep.encode() # What text mode would write for "\n"
+_bytes_isascii = getattr(bytes, 'isascii', None) # Python 3.7+, lets ASCII content skip UTF-8 validation
+
+_WILDCARD_CHARS = frozenset('*?[')
+
+def _has_wildcard(pattern):
+    """Returns True if the pattern needs fnmatch, False if a plain name comparison is enough."""
+    return not _WILDCARD_CHARS.isdisjoint(pattern)
+
+@functools.lru_cache(maxsize=32) # Repeated runs with unchanged exclusions reuse the compiled regex
+def _compile_fnmatch_union(patterns):
+    """Compiles a tuple of fnmatch-style patterns into a single regex and returns its match method (None if no patterns)."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns)).match
+
+def _gitignore_glob_to_regex(glob):
+    """Translates a gitignore glob (without "!" and the trailing "/") into a regex ending in \\Z.
+
+    Follows git's wildmatch rules: '*', '?' and bracket expressions never match '/', "**/" matches
+    any number of leading directories, "/**/" zero or more directories and a trailing "/**"
+    everything inside. A backslash makes the next character literal.
+    """
+    parts = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == '*':
+            if glob.startswith('**', i) and (i == 0 or glob[i - 1] == '/') and (i + 2 == n or glob[i + 2] == '/'):
+                # "**" as a whole path component
+                if i + 2 == n:
+                    parts.append('.*')
+                    i += 2
+                else:
+                    parts.append('(?:.*/)?')
+                    i += 3 # The "/" after "**" is part of the optional group
+                continue
+            while i < n and glob[i] == '*': # Other runs of asterisks act like a single one
+                i += 1
+            parts.append('[^/]*')
+            continue
+        if c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            j = i + 1
+            if j < n and glob[j] in '!^':
+                j += 1
+            if j < n and glob[j] == ']': # A leading "]" is part of the set
+                j += 1
+            j = glob.find(']', j)
+            if j == -1:
+                parts.append(re.escape(c)) # No closing bracket, a literal "["
+            else:
+                items = glob[i + 1:j]
+                negate = items[:1] in ('!', '^')
+                if negate:
+                    items = items[1:]
+                # Characters special inside a regex set are escaped, ranges like a-z are kept
+                items = re.sub(r'([\[\]^&~|\\])', r'\\\1', items.replace('\\', ''))
+                parts.append(f"[{'^/' if negate else ''}{items}]")
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(glob[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts) + r'\Z'
+
+def _bounded_map(executor, fn, items, limit):
+    """Like executor.map, but keeps at most limit calls submitted ahead of the consumer.
+
+    executor.map submits everything up front, so when results are consumed slower than they
+    are produced (e.g. compressed output) they all pile up in memory.
+    """
+    pending = deque()
+    for item in items:
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+    while pending:
+        yield pending.popleft().result()
+
+_COPY_BUFFER_SIZE = 1 << 20 # Block size for copying generated files
+_copy_buffers = threading.local() # One reusable copy buffer per thread, copies may run on a thread pool
+
+def _fastcopy(src, dst):
+    """Copies src to dst with its metadata like shutil.copy2, using an in-kernel copy on Linux."""
+    if not sys.platform.startswith('linux'):
+        shutil.copy2(src, dst) # Already native there: fcopyfile on macOS, CopyFile on Windows
+        return
+    try:
+        dst_stat = os.stat(dst) # One stat answers both "exists" and, with the source's, "same file"
+    except OSError:
+        dst_stat = None
+    if dst_stat is not None and os.path.samestat(os.stat(src), dst_stat):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    with open(src, 'rb', buffering=0) as fsrc, open(dst, 'wb', buffering=0) as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        copy_file_range = getattr(os, 'copy_file_range', None) # Python 3.8+
+        if copy_file_range is not None:
+            try:
+                while copy_file_range(src_fd, dst_fd, _COPY_BUFFER_SIZE * 8):
+                    pass
+            except OSError:
+                pass # Unsupported for these file systems, the steps below continue from the current offsets
+        # sendfile still copies inside the kernel (older kernels or Pythons, cross-device copies)
+        offset = os.lseek(src_fd, 0, os.SEEK_CUR)
+        try:
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, _COPY_BUFFER_SIZE * 8)
+                if not sent:
+                    break
+                offset += sent
+        except OSError:
+            pass # E.g. EINVAL for sources sendfile can't handle
+        os.lseek(src_fd, offset, os.SEEK_SET) # An explicit offset leaves the source position alone
+        # Last resort if neither kernel copy worked, continuing from where they stopped
+        view = getattr(_copy_buffers, 'view', None)
+        if view is None:
+            view = _copy_buffers.view = memoryview(bytearray(_COPY_BUFFER_SIZE))
+        while True:
+            read = fsrc.readinto(view)
+            if not read:
+                break
+            written = 0
+            while written < read: # Unbuffered writes may be partial
+                written += fdst.write(view[written:read])
+    shutil.copystat(src, dst)
+
+def _open_with_system(path):
+    """Opens a file or directory with the platform's default handler without waiting for it or going through a shell."""
+    if sys.platform.startswith('win'):
+        os.startfile(path) # Directories open in Explorer
+    else:
+        opener = 'open' if sys.platform.startswith('darwin') else 'xdg-open'
+        # A session of its own keeps Ctrl+C or SIGHUP sent to the GUI's terminal away from the viewer
+        process = subprocess.Popen([opener, path], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL, start_new_session=True)
+        threading.Thread(target=process.wait, daemon=True).start() # Reaps it when it exits, no zombies
 
 # --- Worker Thread for Processing ---
 class ProcessWorker(QThread):
     progress_update = pyqtSignal(str, int)  # Add percentage
     file_processed = pyqtSignal(str, str)   # filename and content
-    finished = pyqtSignal(str, str, list) # structure_summary, combined_content, errors
+    finished = pyqtSignal(list) # errors; the output itself is already written to output_path
     error = pyqtSignal(str)
 
-    def __init__(self, root_dir, exclude_dirs, exclude_files, exclude_extensions, use_gitignore, include_structure, structure_only):
+    def __init__(self, root_dir, exclude_dirs, exclude_files, exclude_extensions, use_gitignore, include_structure, structure_only, output_path,
+                 max_file_bytes=DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024, max_lines_per_chunk=0, compress=False):
         super().__init__()
         self.root_dir = root_dir
-        self.exclude_dirs = set(exclude_dirs)
+        self.exclude_dirs = frozenset(exclude_dirs) # Read-only lookup set, checked once per directory entry
+        self._exclude_dirs_match = _compile_fnmatch_union(tuple(sorted(d for d in self.exclude_dirs if _has_wildcard(d)))) # e.g. *.egg-info
         self.exclude_files = set(exclude_files)
-        self.exclude_extensions = set(exclude_extensions)
+        # Plain names are answered by the set lookup, only wildcard patterns go into the regex
+        self._exclude_files_match = _compile_fnmatch_union(tuple(sorted(p for p in self.exclude_files if _has_wildcard(p))))
+        self.exclude_extensions = frozenset(ext.lower() for ext in exclude_extensions) # Lowercased once, not per file
         self.use_gitignore = use_gitignore
         self.include_structure = include_structure
         self.structure_only = structure_only # Added structure_only attribute
+        self.output_path = output_path # Output is streamed to this file as it is generated
+        self.max_file_bytes = max_file_bytes # Per-file read limit in bytes, 0 for no limit
+        self.max_lines_per_chunk = max_lines_per_chunk # If set, output_path is split into -PART-N files of at most this many lines
+        self.compress = compress # Write each output file as an independent zstd stream with a .zst suffix
+        self.output_written = False
+        self.output_files = [] # Paths written so far, in order
+        self._output_file = None
+        self._output_raw = None # Underlying file when _output_file is a compressing writer
+        self._part_lines = 0 # Lines written to the current part file
+        self._part_name = None
+        self._last_emit = 0.0 # time.monotonic() of the last throttled progress signal
         self.gitignore_patterns = [] # Initialize gitignore_patterns
+        self.gitignore_rules = [] # Preprocessed form of gitignore_patterns, see _compile_gitignore_rules
+        self._gitignore_dir_rules = {} # Cache: relative directory -> gitignore matchers for its entries
+        self._gitignore_unions = {} # Cache: tuple of rule indices -> compiled union of those rules
 
     def _load_gitignore(self):
         gitignore_path = os.path.join(self.root_dir, '.gitignore')
         patterns = []
-        if self.use_gitignore and os.path.exists(gitignore_path):
-            self.progress_update.emit("Reading .gitignore...", 0)
+        if self.use_gitignore:
             try:
+                # Opened directly: a missing file raises FileNotFoundError, no separate exists() stat needed
                 with open(gitignore_path, 'r', encoding='utf-8', errors='ignore') as f: # Added errors='ignore'
+                    self.progress_update.emit("Reading .gitignore...", 0)
                     for line in f:
                         line = line.strip()
                         if line and not line.startswith('#'):
                             patterns.append(line)
                 self.gitignore_patterns = patterns
+                self._compile_gitignore_rules()
                 self.progress_update.emit(f"Loaded {len(patterns)} patterns from .gitignore.", 0)
+            except FileNotFoundError:
+                self.progress_update.emit(".gitignore not found.", 0)
             except Exception as e:
                 self.progress_update.emit(f"Warning: Could not read .gitignore: {e}", 0)
-        elif self.use_gitignore:
-            self.progress_update.emit(".gitignore not found.", 0)
 
 
-    def _is_excluded(self, path):
+    def _is_excluded(self, name, rel_path, is_dir):
         """Checks if a file or directory should be excluded based on all exclusion rules."""
-        # Get the relative path from the root directory
-        rel_path = os.path.relpath(path, self.root_dir)
-        if rel_path == '.': rel_path = ''  # Normalize root path
-
-        # Get the basename for simple name checks
-        basename = os.path.basename(path)
-
-        # Check if it's a directory
-        is_dir = os.path.isdir(path)
-
-        # 1. Check simple directory name exclusion
-        if is_dir and basename in self.exclude_dirs:
-            return True
-
-        # 2. Check file name/pattern exclusion
-        if not is_dir:
-            if basename in self.exclude_files:
+        # 1. Check directory name/pattern exclusion (excluded directories are never descended into)
+        if is_dir:
+            if name in self.exclude_dirs:
                 return True
-            if any(fnmatch.fnmatchcase(basename, pattern) for pattern in self.exclude_files):
+            if self._exclude_dirs_match is not None and self._exclude_dirs_match(name) is not None:
                 return True
 
-            # 3. Check file extension exclusion
-            _, ext = os.path.splitext(basename)
-            if ext.lower() in self.exclude_extensions:
+        else:
+            # 2. Check file extension exclusion first, it is the cheapest test and rejects the most files
+            # (no extension for names like ".bashrc")
+            stem, _, ext = name.rpartition('.')
+            if stem and '.' + ext.lower() in self.exclude_extensions:
+                return True
+
+            # 3. Check file name/pattern exclusion
+            if name in self.exclude_files:
+                return True
+            if self._exclude_files_match is not None and self._exclude_files_match(name) is not None:
                 return True
 
         # 4. Check gitignore patterns
-        if self.use_gitignore and self._is_excluded_by_gitignore(rel_path):
+        if self.use_gitignore and self._is_excluded_by_gitignore(rel_path, is_dir):
             return True
 
         # Not excluded by any rule
         return False
 
-    def _is_excluded_by_gitignore(self, rel_path):
-        """Checks if a relative path matches any gitignore pattern."""
-        path_to_check = rel_path.replace(os.sep, '/')
-        is_dir = os.path.isdir(os.path.join(self.root_dir, rel_path))
-
-        # Optimization: Pre-compile or process patterns if many? For now, direct matching is fine.
-        # Note: This basic implementation doesn't handle all complexities like negation precedence.
-
+    def _compile_gitignore_rules(self):
+        """Parses gitignore patterns once into (is_negation, anchored, dir_only, prefix_dir, regex) rules."""
+        rules = []
         for pattern in self.gitignore_patterns:
-            original_pattern = pattern # Keep original for logging if needed
-
-            # Handle negation patterns first (simplistic: if it matches negation, it's NOT excluded by *this* rule)
-            # This doesn't handle complex cases like a later non-negation rule overriding a negation rule.
             is_negation = pattern.startswith('!')
             if is_negation:
-                 pattern = pattern[1:]
-                 if not pattern: continue # Ignore "!<empty>"
+                pattern = pattern[1:]
 
-            # Basic handling for directory patterns ending with /
-            is_dir_pattern = pattern.endswith('/')
+            # Directory patterns end with /
+            dir_only = pattern.endswith('/')
             pattern = pattern.rstrip('/')
-            if not pattern: continue # Ignore "/" or "!/" after stripping
-
-            match = False
-            # Handle patterns starting with / (match from root)
-            if pattern.startswith('/'):
-                pattern = pattern.lstrip('/')
-                # Need match at the beginning
-                # Check exact match or if it's a directory prefix
-                if fnmatch.fnmatchcase(path_to_check, pattern) or \
-                   (is_dir and path_to_check.startswith(pattern + '/')) or \
-                   (not is_dir and path_to_check.startswith(pattern + '/')): # Also check files within root-matched dir
-                    match = True
-
-            # Handle patterns without leading / (match anywhere)
-            else:
-                # Check if the pattern matches the basename or any component
-                components = path_to_check.split('/')
-                if fnmatch.fnmatchcase(os.path.basename(path_to_check), pattern) or \
-                    any(fnmatch.fnmatchcase(comp, pattern) for comp in components):
-                    match = True
-
-
-            # Apply match result based on pattern type (dir/file) and negation
-            if match:
-                # Check directory-specific matching (/ at end)
-                if is_dir_pattern and not is_dir:
-                    match = False # Rule is for a directory, but this is a file
-
-            # If it matches, determine final exclusion based on negation
-            if match:
-                if is_negation:
-                    # print(f"Path {rel_path} matches negation pattern {original_pattern}, keeping.")
-                    return False # Match negation means "not excluded (by this rule)" - may be excluded by another
-                else:
-                    # print(f"Path {rel_path} excluded by pattern {original_pattern}")
-                    return True # Excluded by a standard pattern
 
-        # If no standard pattern matched, it's not excluded
-        # If a negation pattern matched, it means it wasn't excluded *by that rule*,
-        # but could still be excluded by a standard rule later (handled above).
-        # So if we reach here, it's not excluded by any rule.
-        return False
+            # A slash at the start or in the middle anchors the pattern to the root, it is then
+            # matched against the whole relative path; otherwise only against entry names
+            anchored = '/' in pattern
+            pattern = pattern.lstrip('/')
+            if not pattern: continue # Ignore "!<empty>", "/" or "!/"
+
+            # Literal directory part of an anchored pattern (before any wildcard), used to skip
+            # the rule for directories it can never reach
+            prefix_dir = re.split(r'[*?[\\]', pattern, maxsplit=1)[0].rpartition('/')[0]
+
+            rules.append((is_negation, anchored, dir_only, prefix_dir, _gitignore_glob_to_regex(pattern)))
+        self.gitignore_rules = rules
+        self._gitignore_dir_rules = {}
+        self._gitignore_unions = {}
 
-    def process_file(self, file_path):
-        """Enhanced file processing with better encoding detection"""
+    def _gitignore_rules_for_dir(self, rel_dir):
+        """Returns the gitignore matchers for entries directly inside rel_dir, cached per directory.
+
+        The result is indexed by is_dir. Each item is (path_match, name_match), unions of the
+        rules matched against the full relative path or the entry name.
+        """
+        checks = []
+        for index, (is_negation, anchored, dir_only, prefix_dir, regex) in enumerate(self.gitignore_rules):
+            if not anchored:
+                checks.append((index, dir_only, 'name'))
+            elif not prefix_dir or rel_dir == prefix_dir or rel_dir.startswith(prefix_dir + '/'):
+                checks.append((index, dir_only, 'path'))
+            # Otherwise the rule's literal prefix can't match anything in this directory
+
+        matchers = (self._gitignore_matchers(checks, False), self._gitignore_matchers(checks, True))
+        self._gitignore_dir_rules[rel_dir] = matchers
+        return matchers
+
+    def _gitignore_matchers(self, checks, is_dir):
+        """Builds (path_match, name_match) from (index, dir_only, kind) checks."""
+        path_indices = []
+        name_indices = []
+        for index, dir_only, kind in checks:
+            if dir_only and not is_dir:
+                continue # Rule is for a directory, but this is a file
+            (path_indices if kind == 'path' else name_indices).append(index)
+        return self._gitignore_union(tuple(path_indices)), self._gitignore_union(tuple(name_indices))
+
+    def _gitignore_union(self, indices):
+        """Compiles the given rules into one regex; the name of the matching group is the last rule that matched."""
+        if not indices:
+            return None
+        union = self._gitignore_unions.get(indices)
+        if union is None:
+            # Alternatives are tried left to right, so the rules go in last to first
+            union = re.compile('|'.join(f"(?P<r{index}>{self.gitignore_rules[index][4]})" for index in reversed(indices))).match
+            self._gitignore_unions[indices] = union
+        return union
+
+    def _is_excluded_by_gitignore(self, rel_path, is_dir):
+        """Checks if a relative path ('/'-separated, as built by the scan) matches any gitignore pattern."""
+        parent_dir, _, name = rel_path.rpartition('/')
+
+        matchers = self._gitignore_dir_rules.get(parent_dir)
+        if matchers is None:
+            matchers = self._gitignore_rules_for_dir(parent_dir)
+        path_match, name_match = matchers[is_dir]
+        last_match = -1
+
+        # As in git, the last matching rule decides, so a later "!pattern" re-includes what an
+        # earlier rule excluded (not inside an excluded directory, which is never descended into)
+        if path_match is not None:
+            m = path_match(rel_path)
+            if m is not None:
+                last_match = max(last_match, int(m.lastgroup[1:]))
+        if name_match is not None:
+            m = name_match(name)
+            if m is not None:
+                last_match = max(last_match, int(m.lastgroup[1:]))
+
+        if last_match < 0:
+            return False # Not excluded by any rule
+        # Match negation means "not excluded", otherwise excluded by a standard pattern
+        return not self.gitignore_rules[last_match][0]
+
+    @staticmethod
+    def _as_utf8(data, complete=True):
+        """Returns raw file bytes as UTF-8 with '\\n' newlines, falling back to latin-1 for binary-like data.
+
+        Valid UTF-8 is passed through as-is, so content is never round-tripped through str (pure
+        ASCII is not even decoded to validate it, which would allocate a full-size copy). With
+        complete=False (truncated data) a multi-byte character cut off at the end is dropped
+        instead of forcing the latin-1 fallback.
+        """
+        try:
+            if not complete:
+                data = codecs.getincrementaldecoder('utf-8')().decode(data).encode('utf-8')
+            elif _bytes_isascii is None or not _bytes_isascii(data):
+                data.decode('utf-8') # Validation only, the content itself stays bytes
+        except UnicodeDecodeError:
+            data = b"[Warning: File read as latin-1, may not be correct]\n" + data.decode('latin-1').encode('utf-8')
+        if b'\r' in data: # Normalize newlines like text mode reading does
+            data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        return data
+
+    def _read_one(self, file_path):
+        """Reads a single file for the output. Returns (UTF-8 content, error, truncated); error is None on success."""
+        limit = self.max_file_bytes
         try:
-            # Try to detect encoding
-            import chardet
+            # Read once as bytes and decode in memory instead of re-opening on decode errors.
+            # Reading one byte past the limit tells us whether the file was cut without a stat() call.
             with open(file_path, 'rb') as f:
-                raw_data = f.read()
-            detected = chardet.detect(raw_data)
-            encoding = detected['encoding'] or 'utf-8'
-
-            # Read with detected encoding
-            content = raw_data.decode(encoding)
-            return content
+                data = f.read(limit + 1) if limit else f.read()
+            if limit and len(data) > limit:
+                content = self._as_utf8(data[:limit], complete=False)
+                return content + f"\n[Truncated: file is larger than {limit // (1024 * 1024)} MB]".encode(), None, True
+            return self._as_utf8(data), None, False
         except Exception as e:
-            return f"[Error reading file: {e}]"
+            return None, e, False
+
+    def _progress_due(self):
+        """Returns True at most once per PROGRESS_UPDATE_INTERVAL, so progress signals don't flood the GUI thread."""
+        now = time.monotonic()
+        if now - self._last_emit < PROGRESS_UPDATE_INTERVAL:
+            return False
+        self._last_emit = now
+        return True
 
-    def estimate_total_files(self):
-        """Count total files for progress tracking"""
-        total = 0
-        for root, _, files in os.walk(self.root_dir):
-            for file in files:
-                if not self._is_excluded(os.path.join(root, file)):
-                    total += 1
-        return total
+    def _open_output(self, path):
+        if not self.output_files: # All parts share one directory, so it is only created for the first
+            output_dir = os.path.dirname(path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+        if self.compress:
+            path += '.zst'
+            self._output_raw = open(path, 'wb', buffering=1 << 20)
+            self._output_file = zstandard.ZstdCompressor(level=3).stream_writer(self._output_raw)
+        else:
+            self._output_file = open(path, 'wb', buffering=1 << 20)
+        self.output_files.append(path)
+        self.output_written = True
+
+    def _part_path(self, part_number):
+        if self._part_name is None: # (prefix, extension), split from output_path once per run
+            base_name, extension = os.path.splitext(self.output_path)
+            self._part_name = (f"{base_name}{'-structure' if self.structure_only else ''}-PART-", extension)
+        prefix, extension = self._part_name
+        return f"{prefix}{part_number}{extension}"
+
+    @staticmethod
+    def _marker_blocks(data):
+        """Yields (block, line_count) pieces of data, starting a new block at every file marker line.
+
+        Works on offsets only: blocks are memoryview slices and lines are counted with bytes.count,
+        so no per-line objects are created.
+        """
+        view = memoryview(data)
+        find, count = data.find, data.count # Bound once, used for every block
+        start = 0
+        marker_pos = find(_MARKER_LINE)
+        while marker_pos != -1:
+            end = marker_pos + 1 # The block ends with the newline before the marker line
+            yield view[start:end], count(b"\n", start, end)
+            start = end
+            marker_pos = find(_MARKER_LINE, end)
+        if start < len(data):
+            # Only the final block can end in an unterminated line
+            yield view[start:], count(b"\n", start) + (not data.endswith(b"\n"))
+
+    @staticmethod
+    def _line_pieces(data, max_lines):
+        """Yields (piece, line_count) slices of data with at most max_lines lines each."""
+        view = memoryview(data)
+        find, size = data.find, len(data) # Hoisted out of the per-line loop below
+        start = 0
+        while start < size:
+            end, line_count = start, 0
+            while line_count < max_lines and end < size:
+                newline = find(b"\n", end)
+                end = newline + 1 if newline != -1 else size
+                line_count += 1
+            yield view[start:end], line_count
+            start = end
+
+    def _write(self, data):
+        if _OUTPUT_NEWLINE != b'\n': # Same line endings as the text mode output had
+            data = bytes(data).replace(b'\n', _OUTPUT_NEWLINE)
+        self._output_file.write(data)
+
+    def _write_output(self, *segments):
+        """Appends UTF-8 segments to the output file, opening it on first use so empty results create no file."""
+        if not self.max_lines_per_chunk:
+            if self._output_file is None:
+                self._open_output(self.output_path)
+            for segment in segments: # Written one by one, file contents are never copied into a joined block
+                self._write(segment)
+            return
+
+        # Chunked output: a block that doesn't fit in the current part starts the next one
+        first, rest = segments[0], segments[1:]
+        if rest and rest[-1].endswith(b"\n") and _MARKER_LINE not in first and not any(_FILE_MARKER in segment for segment in rest):
+            # Common case, the segments are a single block: write them as they are instead of joining them
+            blocks = [(segments, sum(segment.count(b"\n") for segment in segments))]
+        else:
+            blocks = (((block,), line_count) for block, line_count in self._marker_blocks(b"".join(segments)))
+        for block_segments, line_count in blocks:
+            if line_count <= self.max_lines_per_chunk:
+                self._write_block(block_segments, line_count)
+            else:
+                # Too long for any part: cut it at line boundaries so no part exceeds max_lines_per_chunk
+                for piece, piece_lines in self._line_pieces(b"".join(block_segments), self.max_lines_per_chunk):
+                    self._write_block((piece,), piece_lines)
+
+    def _write_block(self, segments, line_count):
+        if self._part_lines and self._part_lines + line_count > self.max_lines_per_chunk:
+            self._close_output()
+            self._part_lines = 0
+        if self._output_file is None:
+            self._open_output(self._part_path(len(self.output_files) + 1))
+        for segment in segments:
+            self._write(segment)
+        self._part_lines += line_count
+
+    def _close_output(self):
+        if self._output_file is not None:
+            self._output_file.close() # Ends the zstd frame when compressing
+            self._output_file = None
+        if self._output_raw is not None:
+            if not self._output_raw.closed: # Older zstandard versions leave the inner file open
+                self._output_raw.close()
+            self._output_raw = None
+
+    def _finish_output(self):
+        """Closes the output; chunked output that fit in one part is renamed to the plain output path."""
+        self._close_output()
+        if self.max_lines_per_chunk and len(self.output_files) == 1:
+            single_path = self.output_path + ('.zst' if self.compress else '')
+            os.replace(self.output_files[0], single_path)
+            self.output_files[0] = single_path
 
     def run(self):
         try:
             self._load_gitignore()
 
             structure_lines = []
-            file_contents = []
             included_files_count = 0
             errors = []
 
             self.progress_update.emit("Starting directory scan...", 10)
 
             collected_items = []
-            processed_paths = set() # To avoid processing duplicates if walk yields variations
-
-            for root, dirs, files in os.walk(self.root_dir, topdown=True):
-                rel_root = os.path.relpath(root, self.root_dir)
-                if rel_root == '.': rel_root = '' # Avoid './' prefix
-
-                # --- Directory Exclusion ---
-                excluded_by_rule = set()
-                original_dirs = list(dirs) # Keep original list for gitignore check
-
-                # Apply simple name exclusion first
-                dirs[:] = [d for d in dirs if d not in self.exclude_dirs]
-
-                # Apply gitignore exclusion (more complex)
-                final_dirs = []
-                for d in dirs:
-                    rel_path_dir = os.path.join(rel_root, d) if rel_root else d
-                    if self._is_excluded_by_gitignore(rel_path_dir):
-                        excluded_by_rule.add(d)
-                    else:
-                        final_dirs.append(d)
-                dirs[:] = final_dirs # Modify dirs in place for os.walk
-
-                # Store potentially included directories for structure summary
-                for d in dirs:
-                    rel_path = os.path.join(rel_root, d) if rel_root else d
-                    norm_path = rel_path.replace(os.sep, '/')
-                    if norm_path not in processed_paths:
-                         collected_items.append((norm_path, True)) # Mark as directory
-                         processed_paths.add(norm_path)
-
-
-                # --- File Exclusion ---
-                for file in files:
-                    rel_path_file = os.path.join(rel_root, file) if rel_root else file
-                    norm_path = rel_path_file.replace(os.sep, '/')
-
-                    if norm_path in processed_paths:
-                        continue # Should not happen often with os.walk but safety check
-
-                    # Check standard name/pattern exclusions
-                    if file in self.exclude_files or \
-                       any(fnmatch.fnmatchcase(file, pattern) for pattern in self.exclude_files): # Use fnmatch for patterns
-                        processed_paths.add(norm_path)
-                        continue
-
-                    # Check extension exclusions
-                    _, ext = os.path.splitext(file)
-                    if ext.lower() in self.exclude_extensions:
-                        processed_paths.add(norm_path)
-                        continue
 
-                    # Check gitignore exclusions
-                    if self._is_excluded_by_gitignore(rel_path_file):
-                        processed_paths.add(norm_path)
+            # Depth-first walk using os.scandir: DirEntry.is_dir() answers from the
+            # file type returned by the directory read, so no per-entry stat() is needed.
+            pending_dirs = [(self.root_dir, '')]
+            scanned_dirs_count = 0
+            found_files_count = 0
+            while pending_dirs:
+                dir_path, rel_root = pending_dirs.pop()
+                scanned_dirs_count += 1
+                if self._progress_due(): # Report scan progress from the running counters
+                    self.progress_update.emit(f"Scanning directories... {scanned_dirs_count} scanned, {found_files_count} files found so far", 10)
+                try:
+                    with os.scandir(dir_path) as it:
+                        entries = list(it)
+                except OSError:
+                    continue # Unreadable directory, skipped like os.walk does
+
+                for entry in entries:
+                    name = entry.name
+                    norm_path = f"{rel_root}/{name}" if rel_root else name
+                    is_dir = entry.is_dir()
+
+                    # Single classification per entry, shared by the structure and file phases
+                    if self._is_excluded(name, norm_path, is_dir):
                         continue
 
-                    # If not excluded, add to collection
-                    collected_items.append((norm_path, False)) # Mark as file
-                    processed_paths.add(norm_path)
+                    collected_items.append((norm_path, is_dir, entry.path)) # entry.path is already OS-native
+                    if not is_dir:
+                        found_files_count += 1
+                    elif not entry.is_symlink(): # Don't follow directory symlinks (os.walk default)
+                        pending_dirs.append((entry.path, norm_path))
 
-            # Sort collected items for predictable structure output
+            # Sort collected items for predictable structure output ('/'-separated display paths are unique,
+            # so the native path in the tuple is never compared)
             collected_items.sort()
 
             # Generate structure summary (if requested) and process file contents
@@ -277,65 +597,55 @@ class ProcessWorker(QThread):
             structure_summary = "Directory Structure:\n====================\n" if (self.include_structure or self.structure_only) else ""
 
             processed_items_count = 0
-            total_items_to_process = len([item for item in collected_items if not item[1]]) # Count only files for processing
-
-            for rel_path, is_dir in collected_items:
-                if (self.include_structure or self.structure_only):
-                    indent = rel_path.count('/')
-                    # Adjust indent if it's a root file/dir (no slashes)
-                    if indent == 0 and '/' in rel_path: # This handles cases where root might have had slashes normalized
-                         pass # Keep indent 0
-                    elif rel_path and '/' not in rel_path: # Root level item
-                         indent = 0
-                    else: # Increase indent for subitems
-                        indent = rel_path.count('/')
-
-                    prefix = "  " * indent + ("📁 " if is_dir else "📄 ")
-                    base_name = os.path.basename(rel_path) if rel_path else os.path.basename(self.root_dir) # Handle root edge case
-                    structure_lines.append(f"{prefix}{base_name}")
-
-                if not is_dir and not self.structure_only: # Skip reading content if structure_only is true
-                    processed_items_count += 1
-                    if processed_items_count % 20 == 0: # Update progress periodically
-                        # Calculate progress percentage (30% to 70% range for file processing)
-                        progress_percent = 30 + int((processed_items_count / max(1, total_items_to_process)) * 40)
-                        self.progress_update.emit(f"Processing file {processed_items_count}/{total_items_to_process}: {rel_path}", progress_percent)
-
-                    file_path = os.path.join(self.root_dir, rel_path.replace('/', os.sep)) # Revert to OS separator for reading
-                    try:
-                        # Try reading as UTF-8 first, fallback to latin-1 for binary-like data
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                        except UnicodeDecodeError:
-                            try:
-                                with open(file_path, 'r', encoding='latin-1') as f:
-                                    content = f.read()
-                                content = f"[Warning: File read as latin-1, may not be correct]\n{content}"
-                            except Exception as inner_e:
-                                raise inner_e # Re-raise if latin-1 also fails
-
-                        file_contents.append(f">>>File: {rel_path}\n\n{content}\n\n{'='*40}\n") # Add separator
-                        included_files_count += 1
-
-                    except Exception as e:
-                        error_msg = f"Error reading file {rel_path}: {e}"
-                        file_contents.append(f">>>File: {rel_path}\n\n[Error reading file: {e}]\n\n{'='*40}\n")
-                        errors.append(error_msg)
+            total_items_to_process = found_files_count # Counted during the scan, only files are processed
 
             if (self.include_structure or self.structure_only):
+                for rel_path, is_dir, _ in collected_items:
+                    indent = rel_path.count('/') # Root level items have no slashes
+                    prefix = (_INDENTS[indent] if indent < len(_INDENTS) else "  " * indent) + (_DIR_ICON if is_dir else _FILE_ICON)
+                    structure_lines.append(f"{prefix}{rel_path.rpartition('/')[2]}")
                 structure_summary += "\n".join(structure_lines) + "\n\n"
-            else:
-                structure_summary = "" # Ensure it's empty if not included
 
-            combined_content = "".join(file_contents) if not self.structure_only else "" # Empty content for structure_only
+            if structure_summary:
+                self._write_output(structure_summary.encode('utf-8'))
+
+            if not self.structure_only: # Skip reading content if structure_only is true
+                file_items = [(rel_path, path) for rel_path, is_dir, path in collected_items if not is_dir]
+
+                # Read files on a thread pool: the GIL is released during file I/O, so reads overlap.
+                # Results come back in submission order, keeping the output sorted. Reads run at most
+                # 2 * max_workers files ahead of the writer, which bounds the content held in memory.
+                max_workers = min(32, (os.cpu_count() or 1) * 4)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = _bounded_map(executor, self._read_one, [path for _, path in file_items], 2 * max_workers)
+                    for (rel_path, _), (content, read_error, truncated) in zip(file_items, results):
+                        processed_items_count += 1
+                        if self._progress_due(): # Update progress periodically
+                            # Calculate progress percentage (30% to 70% range for file processing)
+                            progress_percent = 30 + int((processed_items_count / max(1, total_items_to_process)) * 40)
+                            self.progress_update.emit(f"Processed {processed_items_count}/{total_items_to_process} files", progress_percent)
+
+                        if read_error is None:
+                            block = (_FILE_MARKER + rel_path.encode('utf-8') + b"\n\n", content, _BLOCK_SEPARATOR)
+                            included_files_count += 1
+                            if truncated:
+                                errors.append(f"File {rel_path} was truncated to {self.max_file_bytes // (1024 * 1024)} MB")
+                        else:
+                            errors.append(f"Error reading file {rel_path}: {read_error}")
+                            block = (f">>>File: {rel_path}\n\n[Error reading file: {read_error}]".encode('utf-8'), _BLOCK_SEPARATOR)
+
+                        self._write_output(*block) # Stream to disk as soon as the file is read
+
+            self._finish_output() # Flush before the GUI thread is told the file is ready
 
             self.progress_update.emit(f"Scan complete. Included {included_files_count} files.", 70)
-            self.finished.emit(structure_summary, combined_content, errors)
+            self.finished.emit(errors)
 
         except Exception as e:
             import traceback
             self.error.emit(f"An unexpected error occurred during processing:\n{traceback.format_exc()}")
+        finally:
+            self._close_output()
 
 
 # --- Settings Class ---
@@ -368,10 +678,21 @@ class CodeBaseAnalyzer(QMainWindow):
         # Initialize variables for download functionality
         self.last_output_path = None
         self.last_output_is_chunked = False
+        self._icon_cache = {} # QStyle.StandardPixmap -> QIcon, see _icon
+        self._exclusion_cache = None # Parsed exclusions, reset whenever an exclusion widget changes
+        self._help_dialog = None # Help and About dialogs, created on first use
+        self._about_dialog = None
 
         self.initUI()
         self.apply_theme(self.settings.dark_mode)
 
+    def _icon(self, standard_pixmap):
+        """Returns the style's standard icon, looked up once and reused afterwards."""
+        icon = self._icon_cache.get(standard_pixmap)
+        if icon is None:
+            icon = self._icon_cache[standard_pixmap] = self.style().standardIcon(standard_pixmap)
+        return icon
+
     def initUI(self):
         self.setWindowTitle('Code Base Condenser')
         self.setGeometry(100, 100, 1000, 750)
@@ -403,16 +724,16 @@ class CodeBaseAnalyzer(QMainWindow):
         nav_layout = QHBoxLayout()
 
         self.back_button = QPushButton("Back")
-        self.back_button.setIcon(self.style().standardIcon(QStyle.SP_ArrowBack))
+        self.back_button.setIcon(self._icon(QStyle.SP_ArrowBack))
         self.back_button.clicked.connect(self.go_back)
         self.back_button.setEnabled(False)
 
         self.next_button = QPushButton("Next")
-        self.next_button.setIcon(self.style().standardIcon(QStyle.SP_ArrowForward))
+        self.next_button.setIcon(self._icon(QStyle.SP_ArrowForward))
         self.next_button.clicked.connect(self.go_next)
 
         self.run_button = QPushButton('Generate Condensed Code')
-        self.run_button.setIcon(self.style().standardIcon(QStyle.SP_DialogApplyButton))
+        self.run_button.setIcon(self._icon(QStyle.SP_DialogApplyButton))
         self.run_button.clicked.connect(self.run_analysis)
         self.run_button.setVisible(False)
 
@@ -457,12 +778,12 @@ class CodeBaseAnalyzer(QMainWindow):
         toolbar.addWidget(spacer)
 
         # Help action
-        help_action = QAction(self.style().standardIcon(QStyle.SP_MessageBoxQuestion), "Help", self)
+        help_action = QAction(self._icon(QStyle.SP_MessageBoxQuestion), "Help", self)
         help_action.triggered.connect(self.show_help)
         toolbar.addAction(help_action)
 
         # About action
-        about_action = QAction(self.style().standardIcon(QStyle.SP_FileDialogInfoView), "About", self)
+        about_action = QAction(self._icon(QStyle.SP_FileDialogInfoView), "About", self)
         about_action.triggered.connect(self.show_about)
         toolbar.addAction(about_action)
 
@@ -592,7 +913,7 @@ class CodeBaseAnalyzer(QMainWindow):
                 }
             """)
             # Set dark mode icon
-            self.theme_action.setIcon(self.style().standardIcon(QStyle.SP_DialogApplyButton))
+            self.theme_action.setIcon(self._icon(QStyle.SP_DialogApplyButton))
         else:
             self.setStyleSheet("""
                 QMainWindow, QWidget {
@@ -716,9 +1037,15 @@ class CodeBaseAnalyzer(QMainWindow):
                 }
             """)
             # Set light mode icon
-            self.theme_action.setIcon(self.style().standardIcon(QStyle.SP_DialogCancelButton))
+            self.theme_action.setIcon(self._icon(QStyle.SP_DialogCancelButton))
 
     def show_help(self):
+        # The dialog is built once and reused, so the help HTML is only parsed on the first click
+        if self._help_dialog is None:
+            self._help_dialog = self._create_help_dialog()
+        self._help_dialog.exec_()
+
+    def _create_help_dialog(self):
         help_text = """
         <h2>Code Base Condenser Help</h2>
         <p>This tool helps you prepare your codebase for analysis by Large Language Models (LLMs).</p>
@@ -756,9 +1083,15 @@ class CodeBaseAnalyzer(QMainWindow):
         layout.addWidget(help_text_edit)
         layout.addWidget(close_button, alignment=Qt.AlignCenter)
 
-        help_dialog.exec_()
+        return help_dialog
 
     def show_about(self):
+        # Built once like the help dialog, including its pixmap
+        if self._about_dialog is None:
+            self._about_dialog = self._create_about_dialog()
+        self._about_dialog.exec_()
+
+    def _create_about_dialog(self):
         about_text = """
         <h2>Code Base Condenser</h2>
         <p>Version 2.0</p>
@@ -797,7 +1130,7 @@ class CodeBaseAnalyzer(QMainWindow):
         ok_button.clicked.connect(about_dialog.accept)
         layout.addWidget(ok_button, alignment=Qt.AlignCenter)
 
-        about_dialog.exec_()
+        return about_dialog
 
     def create_project_selection_page(self):
         self.project_page = QWidget()
@@ -825,7 +1158,7 @@ class CodeBaseAnalyzer(QMainWindow):
             self.directory_entry.setText(self.settings.last_directory)
 
         dir_button = QPushButton('Browse...')
-        dir_button.setIcon(self.style().standardIcon(QStyle.SP_DirOpenIcon))
+        dir_button.setIcon(self._icon(QStyle.SP_DirOpenIcon))
         dir_button.clicked.connect(self.choose_directory)
 
         dir_select_layout.addWidget(self.directory_entry)
@@ -836,8 +1169,14 @@ class CodeBaseAnalyzer(QMainWindow):
         file_browser_label = QLabel("Project Structure Preview:")
         dir_layout.addWidget(file_browser_label)
 
+        # Root path is set only once a project directory is chosen (see _set_preview_root);
+        # setRootPath("") would start watching the whole filesystem
         self.file_model = QFileSystemModel()
-        self.file_model.setRootPath("")
+        self.file_model.setResolveSymlinks(False)
+        if hasattr(QFileSystemModel, 'DontWatchForChanges'): # Model options need Qt 5.14+
+            self.file_model.setOption(QFileSystemModel.DontWatchForChanges, True)
+            self.file_model.setOption(QFileSystemModel.DontUseCustomDirectoryIcons, True)
+        self._preview_root = None
 
         self.tree_view = QTreeView()
         self.tree_view.setModel(self.file_model)
@@ -865,7 +1204,7 @@ class CodeBaseAnalyzer(QMainWindow):
             self.output_entry.setText(self.settings.last_output)
 
         output_button = QPushButton('Save As...')
-        output_button.setIcon(self.style().standardIcon(QStyle.SP_DialogSaveButton))
+        output_button.setIcon(self._icon(QStyle.SP_DialogSaveButton))
         output_button.clicked.connect(self.choose_output_file)
 
         output_select_layout.addWidget(self.output_entry)
@@ -899,7 +1238,8 @@ class CodeBaseAnalyzer(QMainWindow):
 
         self.exclude_dirs_entry = QLineEdit()
         self.exclude_dirs_entry.setText(','.join(DEFAULT_EXCLUDE_DIRS))
-        self.exclude_dirs_entry.setToolTip("List of directory names to completely ignore (case-sensitive).")
+        self.exclude_dirs_entry.setToolTip("List of directory names to completely ignore (case-sensitive, wildcards like *.egg-info allowed).")
+        self.exclude_dirs_entry.textChanged.connect(self._invalidate_exclusion_cache)
         dirs_layout.addWidget(self.exclude_dirs_entry)
 
         layout.addWidget(dirs_group)
@@ -914,6 +1254,7 @@ class CodeBaseAnalyzer(QMainWindow):
         self.exclude_files_entry = QLineEdit()
         self.exclude_files_entry.setText(','.join(DEFAULT_EXCLUDE_FILES))
         self.exclude_files_entry.setToolTip("List of specific file names or wildcard patterns (e.g., *.log, setup.?) to ignore (case-sensitive).")
+        self.exclude_files_entry.textChanged.connect(self._invalidate_exclusion_cache)
         files_layout.addWidget(self.exclude_files_entry)
 
         # Use .gitignore
@@ -931,34 +1272,25 @@ class CodeBaseAnalyzer(QMainWindow):
         ext_desc = QLabel("Select file extensions to exclude:")
         ext_layout.addWidget(ext_desc)
 
-        # Create a scrollable area for extensions
-        ext_scroll = QScrollArea()
-        ext_scroll.setWidgetResizable(True)
-        ext_scroll.setMinimumHeight(200)
-
-        ext_content = QWidget()
-        ext_grid = QHBoxLayout(ext_content)
-
-        col_layouts = [QVBoxLayout(), QVBoxLayout(), QVBoxLayout()]
-
-        self.extension_checkboxes = {}
-        col_count = len(col_layouts)
-        sorted_extensions = sorted(DEFAULT_EXCLUDE_EXTENSIONS, key=str.lower)
-        items_per_col = (len(sorted_extensions) + col_count - 1) // col_count
-
-        for i, ext in enumerate(sorted_extensions):
-            checkbox = QCheckBox(ext)
-            checkbox.setChecked(True)
-            self.extension_checkboxes[ext] = checkbox
-            col_index = i // items_per_col
-            col_layouts[col_index].addWidget(checkbox)
-
-        for col_layout in col_layouts:
-            col_layout.addStretch()
-            ext_grid.addLayout(col_layout)
-
-        ext_scroll.setWidget(ext_content)
-        ext_layout.addWidget(ext_scroll)
+        # One list widget with checkable items instead of a checkbox widget per extension;
+        # items flow top to bottom and wrap into columns
+        self.extension_list = QListWidget()
+        self.extension_list.setMinimumHeight(200)
+        self.extension_list.setFlow(QListWidget.TopToBottom)
+        self.extension_list.setWrapping(True)
+        self.extension_list.setResizeMode(QListWidget.Adjust)
+        self.extension_list.setSpacing(2)
+
+        self._checked_extensions = set() # Lowercased extensions of the checked items, kept up to date on change
+        for ext in sorted(DEFAULT_EXCLUDE_EXTENSIONS, key=str.lower):
+            item = QListWidgetItem(ext)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.extension_list.addItem(item)
+            self._checked_extensions.add(ext.lower())
+        self.extension_list.itemChanged.connect(self._extension_item_changed) # Connected after filling the list
+
+        ext_layout.addWidget(self.extension_list)
 
         # Custom extensions
         custom_ext_layout = QHBoxLayout()
@@ -966,6 +1298,7 @@ class CodeBaseAnalyzer(QMainWindow):
         self.custom_exclude_extensions_entry = QLineEdit()
         self.custom_exclude_extensions_entry.setPlaceholderText("E.g., .custom, .generated")
         self.custom_exclude_extensions_entry.setToolTip("Additional file extensions to exclude (comma-separated, with or without dots).")
+        self.custom_exclude_extensions_entry.textChanged.connect(self._invalidate_exclusion_cache)
         custom_ext_layout.addWidget(self.custom_exclude_extensions_entry)
         ext_layout.addLayout(custom_ext_layout)
 
@@ -1012,7 +1345,7 @@ class CodeBaseAnalyzer(QMainWindow):
         self.max_lines_spinbox = QSpinBox()
         self.max_lines_spinbox.setRange(1000, 100000)
         self.max_lines_spinbox.setValue(DEFAULT_MAX_LINES_PER_CHUNK)
-        self.max_lines_spinbox.setToolTip(f"Approximate maximum number of lines per chunk file (Default: {DEFAULT_MAX_LINES_PER_CHUNK}). Splits occur between files.")
+        self.max_lines_spinbox.setToolTip(f"Maximum number of lines per chunk file (Default: {DEFAULT_MAX_LINES_PER_CHUNK}). Splits occur between files, longer files are split across chunks.")
 
         chunk_size_layout.addWidget(self.max_lines_label)
         chunk_size_layout.addWidget(self.max_lines_spinbox)
@@ -1038,6 +1371,36 @@ class CodeBaseAnalyzer(QMainWindow):
 
         layout.addWidget(structure_group)
 
+        # File size limit
+        size_group = QGroupBox("File Size Limit")
+        size_layout = QHBoxLayout(size_group)
+
+        size_layout.addWidget(QLabel("Maximum size per file (MB):"))
+        self.max_file_size_spinbox = QSpinBox()
+        self.max_file_size_spinbox.setRange(0, 1024)
+        self.max_file_size_spinbox.setSpecialValueText("No limit")
+        self.max_file_size_spinbox.setValue(DEFAULT_MAX_FILE_SIZE_MB)
+        self.max_file_size_spinbox.setToolTip(f"Files larger than this are truncated in the output (Default: {DEFAULT_MAX_FILE_SIZE_MB} MB). Protects against huge logs or data files slipping through the exclusions.")
+        size_layout.addWidget(self.max_file_size_spinbox)
+        size_layout.addStretch()
+
+        layout.addWidget(size_group)
+
+        # Compression
+        compress_group = QGroupBox("Compression")
+        compress_layout = QVBoxLayout(compress_group)
+
+        self.compress_checkbox = QCheckBox("Compress output files with zstd (.zst)")
+        self.compress_checkbox.setChecked(False)
+        if zstandard is None:
+            self.compress_checkbox.setEnabled(False)
+            self.compress_checkbox.setToolTip("Requires the optional zstandard package (pip install zstandard).")
+        else:
+            self.compress_checkbox.setToolTip("Each output file is compressed on its own, so chunks stay usable individually. Code typically shrinks 4-6x, which makes writing to slow or network drives faster.")
+        compress_layout.addWidget(self.compress_checkbox)
+
+        layout.addWidget(compress_group)
+
         # Preview section
         preview_group = QGroupBox("Output Preview")
         preview_layout = QVBoxLayout(preview_group)
@@ -1109,6 +1472,7 @@ class TestMain(unittest.TestCase):
         self.summary_text = QTextEdit()
         self.summary_text.setReadOnly(True)
         self.summary_text.setMinimumHeight(300)
+        self._summary_html = None # Last HTML passed to summary_text, see update_summary
         summary_layout.addWidget(self.summary_text)
 
         layout.addWidget(summary_group)
@@ -1117,9 +1481,11 @@ class TestMain(unittest.TestCase):
         self.results_group = QGroupBox("Results")
         self.results_group.setVisible(False)
         self.results_layout = QVBoxLayout(self.results_group)
+        self._results_key = None # (output_path, num_files) of the widgets in results_layout, see show_results
 
-        self.results_text = QTextEdit()
-        self.results_text.setReadOnly(True)
+        self.results_text = QLabel()
+        self.results_text.setTextFormat(Qt.RichText)
+        self.results_text.setWordWrap(True)
         self.results_layout.addWidget(self.results_text)
 
         layout.addWidget(self.results_group)
@@ -1180,8 +1546,7 @@ class TestMain(unittest.TestCase):
         self.settings.save_settings()
 
         # Update file browser
-        self.file_model.setRootPath(self.directory_entry.text())
-        self.tree_view.setRootIndex(self.file_model.index(self.directory_entry.text()))
+        self._set_preview_root(self.directory_entry.text())
 
         return True
 
@@ -1193,14 +1558,14 @@ class TestMain(unittest.TestCase):
         exclude_files = self.exclude_files_entry.text()
         use_gitignore = self.use_gitignore_checkbox.isChecked()
 
-        # Count checked extensions
-        checked_exts = [ext for ext, checkbox in self.extension_checkboxes.items() if checkbox.isChecked()]
         custom_exts = self.custom_exclude_extensions_entry.text()
 
         output_type = "Single file" if self.single_file_radio.isChecked() else "Multiple chunks"
         max_lines = self.max_lines_spinbox.value() if self.chunked_file_radio.isChecked() else "N/A"
         include_structure = self.include_structure_checkbox.isChecked()
         structure_only = self.structure_only_checkbox.isChecked()
+        max_file_size = self.max_file_size_spinbox.value()
+        compress = self.compress_checkbox.isChecked()
 
         # Format summary
         summary = f"""<h3>Project Information</h3>
@@ -1211,7 +1576,7 @@ class TestMain(unittest.TestCase):
 <p><b>Excluded Directories:</b> {exclude_dirs}</p>
 <p><b>Excluded Files/Patterns:</b> {exclude_files}</p>
 <p><b>Use .gitignore:</b> {"Yes" if use_gitignore else "No"}</p>
-<p><b>Excluded Extensions:</b> {len(checked_exts)} selected</p>
+<p><b>Excluded Extensions:</b> {len(self._checked_extensions)} selected</p>
 <p><b>Custom Extensions:</b> {custom_exts if custom_exts else "None"}</p>
 
 <h3>Output Options</h3>
@@ -1219,9 +1584,14 @@ class TestMain(unittest.TestCase):
 <p><b>Max Lines Per Chunk:</b> {max_lines}</p>
 <p><b>Include Directory Structure:</b> {"Yes" if include_structure else "No"}</p>
 <p><b>Structure-Only Output:</b> {"Yes" if structure_only else "No"}</p>
+<p><b>Max File Size:</b> {f"{max_file_size} MB" if max_file_size else "No limit"}</p>
+<p><b>Compress Output:</b> {"Yes (.zst)" if compress else "No"}</p>
 """
 
-        self.summary_text.setHtml(summary)
+        # Only re-parse the HTML when a setting changed since the page was last shown
+        if summary != self._summary_html:
+            self._summary_html = summary
+            self.summary_text.setHtml(summary)
 
     def toggle_chunk_options(self):
         self.chunk_options_widget.setVisible(self.chunked_file_radio.isChecked())
@@ -1247,8 +1617,7 @@ class TestMain(unittest.TestCase):
                 self.output_entry.setText(suggested_path)
 
             # Update file browser
-            self.file_model.setRootPath(directory)
-            self.tree_view.setRootIndex(self.file_model.index(directory))
+            self._set_preview_root(directory)
 
             # Save to settings
             self.settings.last_directory = directory
@@ -1271,21 +1640,49 @@ class TestMain(unittest.TestCase):
             self.settings.last_output = file_path
             self.settings.save_settings()
 
+    def _set_preview_root(self, directory):
+        """Points the structure preview at directory, skipping the model reset if it is already shown."""
+        if directory == self._preview_root:
+            return
+        self._preview_root = directory
+        self.file_model.setRootPath(directory)
+        self.tree_view.setRootIndex(self.file_model.index(directory))
+
+    def _invalidate_exclusion_cache(self, *args):
+        self._exclusion_cache = None
+
+    def _extension_item_changed(self, item):
+        self._toggle_extension(item.text().lower(), item.checkState() == Qt.Checked)
+
+    def _toggle_extension(self, ext, checked):
+        if checked:
+            self._checked_extensions.add(ext)
+        else:
+            self._checked_extensions.discard(ext)
+        self._invalidate_exclusion_cache()
+
     def _parse_exclusions(self):
-        """Parses exclusion lists from the GUI, handling whitespace."""
+        """Parses exclusion lists from the GUI, handling whitespace. The result is reused until an exclusion widget changes.
+
+        Returns frozensets (dirs, files, extensions); extensions are already lowercased and dot-prefixed.
+        """
+        if self._exclusion_cache is not None:
+            return self._exclusion_cache
+
         # Use case-sensitive matching for dirs/files by default, as gitignore often is
-        dirs = {d.strip() for d in self.exclude_dirs_entry.text().split(',') if d.strip()}
-        files = {f.strip() for f in self.exclude_files_entry.text().split(',') if f.strip()}
+        dirs = frozenset(d.strip() for d in self.exclude_dirs_entry.text().split(',') if d.strip())
+        files = frozenset(f.strip() for f in self.exclude_files_entry.text().split(',') if f.strip())
 
         # Extensions are typically case-insensitive
-        checked_exts = {ext.lower() for ext, checkbox in self.extension_checkboxes.items() if checkbox.isChecked()}
+        checked_exts = self._checked_extensions
         custom_exts_raw = self.custom_exclude_extensions_entry.text().split(',')
         custom_exts = {ext.strip().lower() for ext in custom_exts_raw if ext.strip()}
         # Ensure extensions start with a dot
         custom_exts_dotted = {ext if ext.startswith('.') else '.' + ext for ext in custom_exts}
 
-        all_extensions = checked_exts.union(custom_exts_dotted)
-        return dirs, files, all_extensions
+        all_extensions = frozenset(checked_exts.union(custom_exts_dotted))
+        self._exclusion_cache = (dirs, files, all_extensions)
+        return self._exclusion_cache
 
     def run_analysis(self):
         # Get values from UI
@@ -1309,6 +1706,15 @@ class TestMain(unittest.TestCase):
         include_structure = self.include_structure_checkbox.isChecked()
         structure_only = self.structure_only_checkbox.isChecked()
 
+        # Output is streamed straight to disk by the worker, chunked output is split into
+        # -PART-N files as it is written
+        base_name, extension = os.path.splitext(output_path)
+        is_chunked = self.chunked_file_radio.isChecked()
+        if is_chunked:
+            stream_path = base_name + (extension or '.txt')
+        else:
+            stream_path = base_name + ("-structure" if structure_only else "") + (extension or '.txt')
+
         # Start worker thread
         self.worker = ProcessWorker(
             root_dir,
@@ -1317,7 +1723,11 @@ class TestMain(unittest.TestCase):
             exclude_extensions,
             use_gitignore,
             include_structure,
-            structure_only
+            structure_only,
+            stream_path,
+            self.max_file_size_spinbox.value() * 1024 * 1024,
+            self.max_lines_spinbox.value() if is_chunked else 0,
+            self.compress_checkbox.isChecked()
         )
 
         # Connect signals
@@ -1330,19 +1740,24 @@ class TestMain(unittest.TestCase):
 
     def update_status(self, message, percent=0):
         """Update the status bar and progress bar with the current status"""
-        self.status_bar.showMessage(message)
+        # The worker already throttles its signals; skip widget updates that wouldn't change anything
+        if message != self.status_bar.currentMessage():
+            self.status_bar.showMessage(message)
         if percent > 0:
-            self.progress_bar.setValue(percent)
+            if percent != self.progress_bar.value():
+                self.progress_bar.setValue(percent)
             # Make sure progress bar is visible
-            self.progress_bar.setVisible(True)
+            if not self.progress_bar.isVisible():
+                self.progress_bar.setVisible(True)
 
     def handle_error(self, error_message):
         # Log detailed error to console
-        print(f"Error signal received:\n{error_message}")
+        logger.error("Error signal received:\n%s", error_message)
 
         # Show a simpler message in the dialog
-        short_error = "\n".join(error_message.splitlines()[:5])
-        if len(error_message.splitlines()) > 5:
+        lines = error_message.split("\n", 5) # The first 5 lines and the unsplit rest
+        short_error = "\n".join(lines[:5])
+        if len(lines) > 5 and lines[5]:
             short_error += "\n..."
 
         QMessageBox.critical(self, "Error During Processing",
@@ -1354,29 +1769,29 @@ class TestMain(unittest.TestCase):
         self.back_button.setEnabled(True)
         self.run_button.setEnabled(True)
 
-    def handle_results(self, structure_summary, combined_content, errors):
+    def handle_results(self, errors):
         # Get values from worker and UI
         structure_only = self.worker.structure_only
         output_path = self.output_entry.text()
         is_chunked = self.chunked_file_radio.isChecked()
-        max_lines = self.max_lines_spinbox.value() if is_chunked else -1
 
-        # Debug print
-        print(f"DEBUG: handle_results called with output_path={output_path}, is_chunked={is_chunked}")
+        # Debug log
+        logger.debug("handle_results called with output_path=%s, is_chunked=%s", output_path, is_chunked)
 
-        self.status_bar.showMessage("Processing finished. Saving results...")
-        self.progress_bar.setValue(75)  # 75% complete
+        # The worker has already written the output, so the run is complete at this point
+        self.update_status("Processing finished.", 100)
 
         # Store output information for the download button
         self.last_output_path = output_path
         self.last_output_is_chunked = is_chunked
 
         try:
-            # Combine content
-            full_content_to_write = structure_summary + combined_content
+            # The worker already streamed the output (split into parts if chunked) to disk
+            output_files = self.worker.output_files
+            num_files = len(output_files)
 
             # Check if content is empty
-            if not full_content_to_write.strip() and not structure_only:
+            if not self.worker.output_written and not structure_only:
                 QMessageBox.warning(self, "No Content",
                                    "No text content was found or generated after applying exclusions.")
                 self.status_bar.showMessage("Ready. No content generated.")
@@ -1385,68 +1800,15 @@ class TestMain(unittest.TestCase):
                 self.run_button.setEnabled(True)
                 return
 
-            # Prepare output path
-            output_dir = os.path.dirname(output_path)
-            base_name, extension = os.path.splitext(output_path)
-            if not extension:
-                extension = '.txt'
-                output_path = base_name + extension
-
-            # Create output directory if needed
-            if output_dir and not os.path.exists(output_dir):
-                try:
-                    os.makedirs(output_dir)
-                except OSError as e:
-                    raise OSError(f"Failed to create output directory '{output_dir}': {e}")
-
-            # Save content
-            if is_chunked:
-                parts = self.split_content_smart(full_content_to_write, max_lines)
-                num_files = len(parts)
-
-                if num_files == 0:
-                    # No content to save
-                    pass
-                elif num_files == 1:
-                    # Only one chunk, save as single file
-                    self.status_bar.showMessage(f"Saving single file: {os.path.basename(output_path)}")
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(parts[0])
-                    self.show_success_message(f"Analysis complete. Output saved to:\n{output_path}", output_path)
-                else:
-                    # Save multiple chunk files
-                    output_dir_display = output_dir if output_dir else os.getcwd()
-                    base_filename = os.path.basename(base_name)
-                    self.status_bar.showMessage(f"Saving {num_files} chunk files...")
-
-                    saved_files = []
-                    for i, part in enumerate(parts, 1):
-                        if structure_only:
-                            chunk_filename = f"{base_filename}-structure-PART-{i}{extension}"
-                        else:
-                            chunk_filename = f"{base_filename}-PART-{i}{extension}"
-
-                        part_file_path = os.path.join(output_dir, chunk_filename)
-                        self.update_status(f"Saving chunk {i}/{num_files}: {chunk_filename}",
-                                          75 + (i / num_files * 25))  # Progress from 75% to 100%
-
-                        with open(part_file_path, 'w', encoding='utf-8') as f:
-                            f.write(part)
-                        saved_files.append(part_file_path)
-
-                    self.show_success_message(
-                        f"Analysis complete. Output split into {num_files} files in directory:\n{output_dir_display}",
-                        output_dir_display, True)
-            else:
-                # Single file output
-                if structure_only:
-                    output_path_structure = base_name + "-structure" + extension
-                    output_path = output_path_structure
-
-                self.status_bar.showMessage(f"Saving single file: {os.path.basename(output_path)}")
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(full_content_to_write)
-
+            # A single file is reported under its real name (it may have a .zst suffix)
+            output_path = output_files[0] if num_files == 1 else self.worker.output_path
+            self.last_output_path = output_path
+            if num_files > 1:
+                output_dir_display = os.path.dirname(output_path) or os.getcwd()
+                self.show_success_message(
+                    f"Analysis complete. Output split into {num_files} files in directory:\n{output_dir_display}",
+                    output_dir_display, True)
+            elif num_files == 1:
                 self.show_success_message(f"Analysis complete. Output saved to:\n{output_path}", output_path)
 
             # Report any non-critical errors
@@ -1458,8 +1820,8 @@ class TestMain(unittest.TestCase):
                                    f"Some files could not be read properly or were skipped due to encoding issues:\n{error_details}")
 
             # Update results in the UI
-            print(f"DEBUG: Calling show_results with output_path={output_path}, num_files={num_files if is_chunked and num_files > 1 else 1}")
-            self.show_results(output_path, num_files if is_chunked and num_files > 1 else 1)
+            logger.debug("Calling show_results with output_path=%s, num_files=%d", output_path, max(num_files, 1))
+            self.show_results(output_path, max(num_files, 1))
 
         except Exception as e:
             import traceback
@@ -1467,21 +1829,14 @@ class TestMain(unittest.TestCase):
         finally:
             # Reset UI
             if not self.status_bar.currentMessage().startswith("Processing failed"):
-                self.status_bar.showMessage("Ready.")
-            self.progress_bar.setValue(100)
+                self.update_status("Ready.")
             self.back_button.setEnabled(True)
             self.run_button.setEnabled(True)
 
     def open_file(self, file_path):
         """Opens a file using the system's default application"""
         try:
-            # Use the appropriate method based on the operating system
-            if sys.platform.startswith('darwin'):  # macOS
-                os.system(f'open "{file_path}"')
-            elif sys.platform.startswith('win'):   # Windows
-                os.system(f'start "" "{file_path}"')
-            else:  # Linux and other Unix-like systems
-                os.system(f'xdg-open "{file_path}"')
+            _open_with_system(file_path)
             self.status_bar.showMessage(f"Opened file: {file_path}")
         except Exception as e:
             self.status_bar.showMessage(f"Error opening file: {e}")
@@ -1489,13 +1844,7 @@ class TestMain(unittest.TestCase):
     def open_directory(self, dir_path):
         """Opens a directory using the system's file explorer"""
         try:
-            # Use the appropriate method based on the operating system
-            if sys.platform.startswith('darwin'):  # macOS
-                os.system(f'open "{dir_path}"')
-            elif sys.platform.startswith('win'):   # Windows
-                os.system(f'explorer "{dir_path}"')
-            else:  # Linux and other Unix-like systems
-                os.system(f'xdg-open "{dir_path}"')
+            _open_with_system(dir_path)
             self.status_bar.showMessage(f"Opened directory: {dir_path}")
         except Exception as e:
             self.status_bar.showMessage(f"Error opening directory: {e}")
@@ -1520,8 +1869,7 @@ class TestMain(unittest.TestCase):
                     save_path += '.txt'
 
                 # Copy the file to the new location
-                import shutil
-                shutil.copy2(file_path, save_path)
+                _fastcopy(file_path, save_path)
 
                 self.status_bar.showMessage(f"File downloaded to: {save_path}")
 
@@ -1551,26 +1899,30 @@ class TestMain(unittest.TestCase):
             )
 
             if save_dir:
-                # Get all files in the source directory that match the base name pattern
-                import glob
-                import shutil
-
                 # Get the base name without extension
                 base_name_no_ext = os.path.splitext(base_name)[0]
 
-                # Find all files matching the pattern
-                file_pattern = os.path.join(dir_path, f"{base_name_no_ext}*")
-                files_to_copy = glob.glob(file_pattern)
+                # Destination paths are built from the entry names with one prefix, no per-file path calls
+                dest_prefix = os.path.join(save_dir, '')
+
+                # Find all files in the source directory starting with the base name. A literal prefix
+                # test on scandir entries needs no pattern compilation or stat() calls, and brackets
+                # in the name aren't treated as wildcards
+                files_to_copy, dest_paths = [], []
+                with os.scandir(dir_path or os.curdir) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(base_name_no_ext) and entry.is_file():
+                            files_to_copy.append(entry.path)
+                            dest_paths.append(dest_prefix + entry.name)
 
                 if not files_to_copy:
                     QMessageBox.warning(self, "No Files Found", f"No files matching {base_name_no_ext}* were found in {dir_path}")
                     return
 
-                # Copy each file to the destination directory
-                for file_path in files_to_copy:
-                    file_name = os.path.basename(file_path)
-                    dest_path = os.path.join(save_dir, file_name)
-                    shutil.copy2(file_path, dest_path)
+                # Copy the files in parallel, the copies are independent and I/O-bound
+                with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as executor:
+                    for _ in executor.map(_fastcopy, files_to_copy, dest_paths):
+                        pass # Iterating re-raises the first copy error
 
                 self.status_bar.showMessage(f"{len(files_to_copy)} files downloaded to: {save_dir}")
 
@@ -1612,8 +1964,8 @@ class TestMain(unittest.TestCase):
 
     def show_success_message(self, message, file_path=None, is_directory=False):
         """Shows a success message with options to open the file or directory"""
-        # Debug print
-        print(f"DEBUG: show_success_message called with file_path={file_path}, is_directory={is_directory}")
+        # Debug log
+        logger.debug("show_success_message called with file_path=%s, is_directory=%s", file_path, is_directory)
 
         # Create a custom dialog instead of QMessageBox for better button control
         dialog = QDialog(self)
@@ -1625,7 +1977,7 @@ class TestMain(unittest.TestCase):
 
         # Add icon and message
         icon_label = QLabel()
-        icon_label.setPixmap(self.style().standardIcon(QStyle.SP_MessageBoxInformation).pixmap(32, 32))
+        icon_label.setPixmap(self._icon(QStyle.SP_MessageBoxInformation).pixmap(32, 32))
 
         message_label = QLabel(message)
         message_label.setWordWrap(True)
@@ -1643,10 +1995,10 @@ class TestMain(unittest.TestCase):
         if file_path:
             open_button = QPushButton("Open Now")
             if is_directory:
-                open_button.setIcon(self.style().standardIcon(QStyle.SP_DirIcon))
+                open_button.setIcon(self._icon(QStyle.SP_DirIcon))
                 open_button.clicked.connect(lambda: self.open_directory(file_path))
             else:
-                open_button.setIcon(self.style().standardIcon(QStyle.SP_FileIcon))
+                open_button.setIcon(self._icon(QStyle.SP_FileIcon))
                 open_button.clicked.connect(lambda: self.open_file(file_path))
 
             open_button.clicked.connect(dialog.accept)
@@ -1663,13 +2015,28 @@ class TestMain(unittest.TestCase):
         # Show dialog
         dialog.exec_()
 
+    def _create_result_button(self, text, standard_pixmap, on_click):
+        """Creates one of the large action buttons of the results section."""
+        button = QPushButton(text)
+        button.setIcon(self._icon(standard_pixmap))
+        button.setIconSize(_RESULT_BUTTON_ICON_SIZE)
+        button.setMinimumHeight(40)
+        button.setStyleSheet(_RESULT_BUTTON_STYLE)
+        button.clicked.connect(on_click)
+        return button
+
     def show_results(self, output_path, num_files):
         """Updates the results section in the summary page"""
-        # Debug print
-        print(f"DEBUG: show_results called with output_path={output_path}, num_files={num_files}")
+        # Debug log
+        logger.debug("show_results called with output_path=%s, num_files=%d", output_path, num_files)
 
         self.results_group.setVisible(True)
 
+        # Same output as last time, the existing text and buttons still apply
+        if (output_path, num_files) == self._results_key:
+            return
+        self._results_key = (output_path, num_files)
+
         # Clear any existing layout in the results group
         if hasattr(self, 'results_layout'):
             # Remove old widgets
@@ -1698,10 +2065,11 @@ class TestMain(unittest.TestCase):
             <p>Tip: Start with the first chunk which contains the directory structure.</p>
             """
 
-        # Update the text widget
-        self.results_text = QTextEdit()
-        self.results_text.setReadOnly(True)
-        self.results_text.setHtml(results_html)
+        # Update the text widget (a rich text label is enough for these few static lines)
+        self.results_text = QLabel(results_html)
+        self.results_text.setTextFormat(Qt.RichText)
+        self.results_text.setWordWrap(True)
+        self.results_text.setTextInteractionFlags(Qt.TextBrowserInteraction) # Keeps the output path selectable
         self.results_layout.addWidget(self.results_text)
 
         # Create a frame for the buttons with a different background
@@ -1719,140 +2087,20 @@ class TestMain(unittest.TestCase):
         # Add buttons based on output type
         if num_files == 1:
             # Add a button to open the file
-            open_file_button = QPushButton("  Open Generated File")
-            open_file_button.setIcon(self.style().standardIcon(QStyle.SP_FileIcon))
-            open_file_button.setIconSize(QSize(24, 24))
-            open_file_button.setMinimumHeight(40)
-            open_file_button.setStyleSheet("""
-                QPushButton {
-                    font-size: 14px;
-                    font-weight: bold;
-                    text-align: left;
-                    padding-left: 15px;
-                }
-            """)
-            open_file_button.clicked.connect(lambda: self.open_file(output_path))
-            button_layout.addWidget(open_file_button)
+            button_layout.addWidget(self._create_result_button("  Open Generated File", QStyle.SP_FileIcon, lambda: self.open_file(output_path)))
 
             # Add a download button for the file
-            download_button = QPushButton("  Download Generated File")
-            download_button.setIcon(self.style().standardIcon(QStyle.SP_DialogSaveButton))
-            download_button.setIconSize(QSize(24, 24))
-            download_button.setMinimumHeight(40)
-            download_button.setStyleSheet("""
-                QPushButton {
-                    font-size: 14px;
-                    font-weight: bold;
-                    text-align: left;
-                    padding-left: 15px;
-                }
-            """)
-            download_button.clicked.connect(lambda: self.download_file(output_path))
-            button_layout.addWidget(download_button)
+            button_layout.addWidget(self._create_result_button("  Download Generated File", QStyle.SP_DialogSaveButton, lambda: self.download_file(output_path)))
         else:
             # Add a button to open the directory
-            open_dir_button = QPushButton("  Open Output Directory")
-            open_dir_button.setIcon(self.style().standardIcon(QStyle.SP_DirIcon))
-            open_dir_button.setIconSize(QSize(24, 24))
-            open_dir_button.setMinimumHeight(40)
-            open_dir_button.setStyleSheet("""
-                QPushButton {
-                    font-size: 14px;
-                    font-weight: bold;
-                    text-align: left;
-                    padding-left: 15px;
-                }
-            """)
-            open_dir_button.clicked.connect(lambda: self.open_directory(os.path.dirname(output_path)))
-            button_layout.addWidget(open_dir_button)
+            button_layout.addWidget(self._create_result_button("  Open Output Directory", QStyle.SP_DirIcon, lambda: self.open_directory(os.path.dirname(output_path))))
 
             # Add a download button for the directory
-            download_button = QPushButton("  Download All Files")
-            download_button.setIcon(self.style().standardIcon(QStyle.SP_DialogSaveButton))
-            download_button.setIconSize(QSize(24, 24))
-            download_button.setMinimumHeight(40)
-            download_button.setStyleSheet("""
-                QPushButton {
-                    font-size: 14px;
-                    font-weight: bold;
-                    text-align: left;
-                    padding-left: 15px;
-                }
-            """)
-            download_button.clicked.connect(lambda: self.download_directory(os.path.dirname(output_path), os.path.basename(output_path)))
-            button_layout.addWidget(download_button)
+            button_layout.addWidget(self._create_result_button("  Download All Files", QStyle.SP_DialogSaveButton, lambda: self.download_directory(os.path.dirname(output_path), os.path.basename(output_path))))
 
         # Add the button frame to the results layout
         self.results_layout.addWidget(button_frame)
 
-    def split_content_smart(self, content, max_lines):
-        """Splits content into chunks, trying to keep files intact."""
-        self.update_status(f"Splitting content into chunks (max {max_lines} lines each)...")
-        if not content: return [] # Handle empty content to avoid split errors
-        lines = content.splitlines(keepends=True) # Keep newlines
-        if not lines: return []
-
-        parts = []
-        current_part_lines = []
-        current_line_count = 0
-        file_marker = ">>>File: "
-
-        # Find line indices of file markers
-        marker_indices = [-1] # Add dummy index for content before the first marker
-        marker_indices.extend([i for i, line in enumerate(lines) if line.startswith(file_marker)])
-
-        for i in range(len(marker_indices)):
-            start_index = marker_indices[i] + 1 # Start after the previous marker (or from beginning)
-            # If it's the *first* block (before any file marker), start_index will be 0
-            if i == 0 and start_index == 0 and marker_indices[0] == -1 : start_index = 0
-
-            # Find the end of the current block (start of the next marker or end of content)
-            end_index = marker_indices[i+1] if i + 1 < len(marker_indices) else len(lines)
-
-            block_lines = lines[start_index:end_index]
-            block_line_count = len(block_lines)
-
-            # Include the marker line itself in the block if it's not the first dummy marker
-            if i > 0:
-                marker_line_index = marker_indices[i]
-                block_lines.insert(0, lines[marker_line_index])
-                block_line_count += 1
-
-
-            if not block_lines: continue # Skip if block is somehow empty
-
-            # If the current block *itself* is larger than max_lines, it needs special handling
-            # For now, we just put it in its own chunk (or append if current chunk is empty)
-            if block_line_count > max_lines:
-                # If there's content in the current part, finalize it first
-                if current_part_lines:
-                    parts.append("".join(current_part_lines))
-                    current_part_lines = []
-                    current_line_count = 0
-
-                # Add the huge block as its own part (potentially oversized)
-                parts.append("".join(block_lines))
-                # Continue to next block, skipping normal append logic for this one
-                continue
-
-            # Check if adding this block exceeds the limit
-            if current_line_count > 0 and current_line_count + block_line_count > max_lines:
-                # Current block doesn't fit, finalize the previous part
-                parts.append("".join(current_part_lines))
-                current_part_lines = [] # Start new part
-                current_line_count = 0
-
-            # Add the current block to the current part
-            current_part_lines.extend(block_lines)
-            current_line_count += block_line_count
-
-        # Add the last remaining part
-        if current_part_lines:
-            parts.append("".join(current_part_lines))
-
-        self.update_status(f"Splitting complete. Generated {len(parts)} chunks.")
-        return parts
-
     # Override closeEvent to stop the worker thread if running
     def closeEvent(self, event):
         # Save settings
@@ -1875,478 +2123,14 @@ class TestMain(unittest.TestCase):
         else:
             event.accept()
 
-# --- Main Layout ---
-        main_layout = QVBoxLayout()
-
-        # --- Input/Output Paths ---
-        path_group = QGroupBox("Input & Output")
-        path_layout = QVBoxLayout()
-
-        # Directory selection
-        dir_layout = QHBoxLayout()
-        dir_layout.addWidget(QLabel('Project Directory:'))
-        self.directory_entry = QLineEdit()
-        self.directory_entry.setPlaceholderText("Select the root directory of your project")
-        self.directory_entry.setToolTip("The main folder containing the code you want to analyze.")
-        dir_layout.addWidget(self.directory_entry)
-        dir_button = QPushButton('Browse...')
-        dir_button.clicked.connect(self.choose_directory)
-        dir_layout.addWidget(dir_button)
-        path_layout.addLayout(dir_layout)
-
-        # Output file/base selection
-        output_layout = QHBoxLayout()
-        output_layout.addWidget(QLabel('Output File/Base Name:'))
-        self.output_entry = QLineEdit()
-        self.output_entry.setPlaceholderText("Specify output .txt file (e.g., project_code.txt)")
-        self.output_entry.setToolTip("The name for the output file. If chunking, this will be used as a base name (e.g., base-part-1.txt).")
-        output_layout.addWidget(self.output_entry)
-        output_button = QPushButton('Save As...')
-        output_button.clicked.connect(self.choose_output_file)
-        output_layout.addWidget(output_button)
-        path_layout.addLayout(output_layout)
-
-        path_group.setLayout(path_layout)
-        main_layout.addWidget(path_group)
-
-        # --- Exclusion Settings ---
-        exclude_group = QGroupBox("Exclusion Rules")
-        exclude_layout = QVBoxLayout()
-
-        # Exclude directories
-        exclude_dirs_layout = QHBoxLayout()
-        exclude_dirs_layout.addWidget(QLabel('Exclude Directories (comma-separated):'))
-        self.exclude_dirs_entry = QLineEdit()
-        self.exclude_dirs_entry.setText(','.join(DEFAULT_EXCLUDE_DIRS))
-        self.exclude_dirs_entry.setToolTip("List of directory names to completely ignore (case-sensitive).")
-        exclude_dirs_layout.addWidget(self.exclude_dirs_entry)
-        exclude_layout.addLayout(exclude_dirs_layout)
-
-        # Exclude files/patterns
-        exclude_files_layout = QHBoxLayout()
-        exclude_files_layout.addWidget(QLabel('Exclude Files/Patterns (comma-separated):'))
-        self.exclude_files_entry = QLineEdit()
-        self.exclude_files_entry.setText(','.join(DEFAULT_EXCLUDE_FILES))
-        self.exclude_files_entry.setToolTip("List of specific file names or wildcard patterns (e.g., *.log, setup.?) to ignore (case-sensitive).")
-        exclude_files_layout.addWidget(self.exclude_files_entry)
-        exclude_layout.addLayout(exclude_files_layout)
-
-        # Use .gitignore
-        self.use_gitignore_checkbox = QCheckBox("Use .gitignore rules found in the project directory")
-        self.use_gitignore_checkbox.setChecked(True) # <<< Default Checked
-        self.use_gitignore_checkbox.setToolTip("If checked, rules from a .gitignore file in the root directory will also be applied (basic pattern support).")
-        exclude_layout.addWidget(self.use_gitignore_checkbox)
-
-        # Exclude file extensions group box wrapping the scroll area content
-        extensions_outer_group = QGroupBox("Exclude Common Non-Code File Extensions")
-        extensions_outer_group.setFlat(True)
-        extensions_outer_layout = QVBoxLayout(extensions_outer_group) # Use this layout for content inside group
-
-        # Container widget for the grid inside the scroll area
-        extensions_scroll_content_widget = QWidget()
-        extensions_grid_layout = QHBoxLayout(extensions_scroll_content_widget) # Use horizontal layout for columns
-
-        col_layouts = [QVBoxLayout(), QVBoxLayout(), QVBoxLayout()] # 3 columns
-
-        self.extension_checkboxes = {}
-        col_count = len(col_layouts)
-        # Sort extensions alphabetically for display
-        sorted_extensions = sorted(DEFAULT_EXCLUDE_EXTENSIONS, key=str.lower)
-        items_per_col = (len(sorted_extensions) + col_count - 1) // col_count # Ceiling division
-
-        for i, ext in enumerate(sorted_extensions):
-            checkbox = QCheckBox(ext)
-            checkbox.setChecked(True) # <<< Default Checked
-            self.extension_checkboxes[ext] = checkbox
-            col_index = i // items_per_col
-            col_layouts[col_index].addWidget(checkbox)
-
-        for col_layout in col_layouts:
-            col_layout.addStretch() # Push checkboxes up
-            extensions_grid_layout.addLayout(col_layout)
-
-        # Add custom extensions input below the grid
-        custom_ext_layout = QHBoxLayout()
-        custom_ext_layout.addWidget(QLabel("Other extensions to exclude (e.g., .dat,.bin):"))
-        self.custom_exclude_extensions_entry = QLineEdit()
-        self.custom_exclude_extensions_entry.setToolTip("Add any other file extensions (comma-separated, include the dot).")
-        custom_ext_layout.addWidget(self.custom_exclude_extensions_entry)
-
-        # Add grid and custom input to the outer group's layout
-        extensions_outer_layout.addWidget(extensions_scroll_content_widget)
-        extensions_outer_layout.addLayout(custom_ext_layout)
-
-
-        # Add scroll area for the extensions group box
-        scroll = QScrollArea()
-        scroll.setWidget(extensions_outer_group) # Put the group inside scroll
-        scroll.setWidgetResizable(True)
-        scroll.setFixedHeight(200) # Adjust height as needed
-        # scroll.setStyleSheet("background-color: transparent;") # Inherit background from parent
-        exclude_layout.addWidget(scroll)
-
-
-        exclude_group.setLayout(exclude_layout)
-        main_layout.addWidget(exclude_group)
-
-
-        # --- Output Format Options ---
-        output_options_group = QGroupBox("Output Options")
-        output_options_layout = QVBoxLayout()
-
-        self.include_structure_checkbox = QCheckBox("Include directory structure summary at the beginning")
-        self.include_structure_checkbox.setChecked(True) # <<< Default Checked
-        self.include_structure_checkbox.setToolTip("Adds a formatted list of included files and directories at the start of the output.")
-        output_options_layout.addWidget(self.include_structure_checkbox)
-
-        self.structure_only_checkbox = QCheckBox("Create file/directory structure only")
-        self.structure_only_checkbox.setToolTip("If checked, only the directory and file structure will be created, without file contents.")
-        self.structure_only_checkbox.toggled.connect(self.toggle_structure_options) # Connect toggle event
-        output_options_layout.addWidget(self.structure_only_checkbox)
-
-        # Output type radio buttons
-        self.single_file_radio = QRadioButton("Output as a single file")
-        self.single_file_radio.setChecked(True) # <<< Default Selected
-        self.single_file_radio.toggled.connect(self.toggle_chunk_options)
-        output_options_layout.addWidget(self.single_file_radio)
-
-        self.chunked_file_radio = QRadioButton("Chunk output into multiple files")
-        self.chunked_file_radio.toggled.connect(self.toggle_chunk_options)
-        output_options_layout.addWidget(self.chunked_file_radio)
-
-        # Chunk size options (initially disabled)
-        self.chunk_options_widget = QWidget() # Container for chunk options
-        chunk_size_layout = QHBoxLayout(self.chunk_options_widget)
-        chunk_size_layout.setContentsMargins(20, 0, 0, 0) # Indent chunk options
-        self.max_lines_label = QLabel("Max lines per chunk:")
-        self.max_lines_spinbox = QSpinBox()
-        self.max_lines_spinbox.setRange(100, 1000000) # Set reasonable limits
-        self.max_lines_spinbox.setValue(DEFAULT_MAX_LINES_PER_CHUNK)
-        self.max_lines_spinbox.setToolTip(f"Approximate maximum number of lines per chunk file (Default: {DEFAULT_MAX_LINES_PER_CHUNK}). Splits occur between files.")
-        chunk_size_layout.addWidget(self.max_lines_label)
-        chunk_size_layout.addWidget(self.max_lines_spinbox)
-        chunk_size_layout.addStretch()
-        output_options_layout.addWidget(self.chunk_options_widget)
-
-        output_options_group.setLayout(output_options_layout)
-        main_layout.addWidget(output_options_group)
-
-        # --- Run Button ---
-        self.run_button = QPushButton('Generate Condensed Code')
-        # self.run_button.setIcon(QIcon.fromTheme("system-run")) # Icons can be iffy cross-platform
-        self.run_button.clicked.connect(self.run_analysis)
-        main_layout.addWidget(self.run_button, alignment=Qt.AlignCenter)
-
-        # --- Status Bar ---
-        self.status_bar = QStatusBar()
-        self.status_bar.showMessage("Ready.")
-        main_layout.addWidget(self.status_bar)
-
-        self.setLayout(main_layout)
-
-        # Initial state update
-        self.toggle_chunk_options()
-        self.toggle_structure_options() # Initialize structure options state
-
-    def choose_directory(self):
-        # Try to start in the currently entered directory or user's home
-        start_dir = self.directory_entry.text() or os.path.expanduser("~")
-        directory = QFileDialog.getExistingDirectory(self, "Select Project Directory", start_dir)
-        if directory:
-            self.directory_entry.setText(directory)
-            # Auto-suggest output file name based on directory if output is empty
-            if not self.output_entry.text().strip():
-                 base_name = os.path.basename(directory)
-                 # Suggest output in the *parent* directory of the selected project, or home if no parent
-                 parent_dir = os.path.dirname(directory) or os.path.expanduser("~")
-                 suggested_path = os.path.join(parent_dir, f"{base_name}_codebase.txt")
-                 self.output_entry.setText(suggested_path)
-
-
-    def choose_output_file(self):
-        # Suggest a directory based on the input directory or output entry
-        current_output = self.output_entry.text()
-        default_dir = os.path.dirname(current_output) or os.path.dirname(self.directory_entry.text()) or os.path.expanduser("~")
-        suggested_filename = current_output or os.path.join(default_dir, "project_codebase.txt")
-
-        file_path, _ = QFileDialog.getSaveFileName(self, "Save Output File", suggested_filename, "Text Files (*.txt);;All Files (*)")
-        if file_path:
-            # Ensure it has a .txt extension if none provided and filter was txt
-            if not os.path.splitext(file_path)[1] and 'Text Files' in _:
-                file_path += '.txt'
-            self.output_entry.setText(file_path)
-
-    def toggle_chunk_options(self):
-        is_chunked = self.chunked_file_radio.isChecked()
-        self.chunk_options_widget.setEnabled(is_chunked)
-        # Visually indicate disabled state better
-        self.max_lines_label.setEnabled(is_chunked)
-        self.max_lines_spinbox.setEnabled(is_chunked)
-
-    def toggle_structure_options(self):
-        """Handle mutual exclusivity between structure checkboxes."""
-        if self.structure_only_checkbox.isChecked():
-            # If structure_only is checked, uncheck and disable include_structure
-            self.include_structure_checkbox.setChecked(False)
-            self.include_structure_checkbox.setEnabled(False)
-        else:
-            # If structure_only is unchecked, re-enable include_structure
-            self.include_structure_checkbox.setEnabled(True)
-
-    def _parse_exclusions(self):
-        """Parses exclusion lists from the GUI, handling whitespace."""
-        # Use case-sensitive matching for dirs/files by default, as gitignore often is
-        dirs = {d.strip() for d in self.exclude_dirs_entry.text().split(',') if d.strip()}
-        files = {f.strip() for f in self.exclude_files_entry.text().split(',') if f.strip()}
-
-        # Extensions are typically case-insensitive
-        checked_exts = {ext.lower() for ext, checkbox in self.extension_checkboxes.items() if checkbox.isChecked()}
-        custom_exts_raw = self.custom_exclude_extensions_entry.text().split(',')
-        custom_exts = {ext.strip().lower() for ext in custom_exts_raw if ext.strip()}
-        # Ensure extensions start with a dot
-        custom_exts_dotted = {ext if ext.startswith('.') else '.' + ext for ext in custom_exts}
-
-        all_extensions = checked_exts.union(custom_exts_dotted)
-        return dirs, files, all_extensions
-
-    def run_analysis(self):
-        root_dir = self.directory_entry.text()
-        output_path = self.output_entry.text()
-
-        if not root_dir or not os.path.isdir(root_dir):
-            QMessageBox.warning(self, "Input Error", "Please select a valid project directory.")
-            return
-        if not output_path:
-            QMessageBox.warning(self, "Input Error", "Please specify an output file name/path.")
-            return
-        # Check if output directory exists
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.isdir(output_dir):
-             QMessageBox.warning(self, "Input Error", f"The output directory does not exist:\n{output_dir}")
-             return
-
-
-        if self.worker and self.worker.isRunning():
-            QMessageBox.information(self, "Busy", "Processing is already in progress.")
-            return
-
-        self.run_button.setEnabled(False)
-        self.status_bar.showMessage("Starting analysis...")
-
-        exclude_dirs, exclude_files, exclude_extensions = self._parse_exclusions()
-        use_gitignore = self.use_gitignore_checkbox.isChecked()
-        include_structure = self.include_structure_checkbox.isChecked()
-        structure_only = self.structure_only_checkbox.isChecked() # Get structure_only state
-
-        # --- Start Worker Thread ---
-        self.worker = ProcessWorker(
-            root_dir,
-            exclude_dirs,
-            exclude_files,
-            exclude_extensions,
-            use_gitignore,
-            include_structure,
-            structure_only
-        )
-        self.worker.progress_update.connect(self.update_status)
-        self.worker.finished.connect(self.handle_results)
-        self.worker.error.connect(self.handle_error)
-        # Connect finished signal to re-enable button *after* results handled
-        self.worker.finished.connect(lambda: self.run_button.setEnabled(True))
-        self.worker.error.connect(lambda: self.run_button.setEnabled(True)) # Also re-enable on error
-        self.worker.start()
-
-    def update_status(self, message):
-        self.status_bar.showMessage(message)
-
-    def handle_error(self, error_message):
-        print(f"Error signal received:\n{error_message}") # Log detailed error to console
-        # Show a simpler message in the dialog
-        short_error = "\n".join(error_message.splitlines()[:5]) # Show first few lines
-        if len(error_message.splitlines()) > 5:
-            short_error += "\n..."
-        QMessageBox.critical(self, "Error During Processing", f"An error occurred:\n{short_error}\n\nCheck console for details.")
-        self.status_bar.showMessage("Processing failed. See console for details.")
-        # Button re-enabled via connection in run_analysis
-
-    def handle_results(self, structure_summary, combined_content, errors):
-        structure_only = self.worker.structure_only # Get structure_only from worker
-        self.status_bar.showMessage("Processing finished. Saving results...")
-        output_path = self.output_entry.text()
-        is_chunked = self.chunked_file_radio.isChecked()
-        max_lines = self.max_lines_spinbox.value() if is_chunked else -1
-
-        try:
-            full_content_to_write = structure_summary + combined_content
-            if not full_content_to_write.strip() and not structure_only: # Check content only if not structure_only
-                QMessageBox.warning(self, "No Content", "No text content was found or generated after applying exclusions.")
-                self.status_bar.showMessage("Ready. No content generated.")
-                # self.run_button.setEnabled(True) # Handled by signal connection
-                return # Stop here if no content
-
-            base_name, extension = os.path.splitext(output_path)
-            if not extension: # Ensure extension exists if none provided
-                extension = ".txt"
-                output_path += extension
-            # Recalculate base_name in case extension was added
-            base_name = output_path[:-len(extension)]
-
-            output_dir = os.path.dirname(output_path)
-            # Create output directory if it doesn't exist (should be checked before, but double check)
-            if output_dir and not os.path.exists(output_dir):
-                try:
-                    os.makedirs(output_dir)
-                except OSError as e:
-                    raise OSError(f"Failed to create output directory '{output_dir}': {e}")
-
-
-            if is_chunked:
-                parts = self.split_content_smart(full_content_to_write, max_lines)
-                num_files = len(parts)
-                if num_files == 0:
-                    # This case is already handled by the empty content check above
-                    pass
-                elif num_files == 1:
-                    # Only one chunk, save as single file
-                    self.status_bar.showMessage(f"Saving single file: {os.path.basename(output_path)}")
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(parts[0])
-                    QMessageBox.information(self, "Success", f"Analysis complete. Output saved to:\n{output_path}")
-                else:
-                    # Save multiple chunk files
-                    output_dir_display = output_dir if output_dir else os.getcwd() # Show current dir if no path given
-                    base_filename = os.path.basename(base_name)
-                    self.status_bar.showMessage(f"Saving {num_files} chunk files...")
-                    for i, part in enumerate(parts, 1):
-                        if structure_only:
-                            chunk_filename = f"{base_filename}-structure-PART-{i}{extension}" # Distinct name for structure only
-                        else:
-                            # Format chunk name consistently
-                            chunk_filename = f"{base_filename}-PART-{i}{extension}"
-                        part_file_path = os.path.join(output_dir, chunk_filename)
-                        self.update_status(f"Saving chunk {i}/{num_files}: {chunk_filename}")
-                        with open(part_file_path, 'w', encoding='utf-8') as f:
-                            f.write(part)
-                    QMessageBox.information(self, "Success", f"Analysis complete. Output split into {num_files} files (e.g., {base_filename}-PART-1{extension}) in directory:\n{output_dir_display}")
-
-            else: # Single file output
-                if structure_only:
-                    output_path_structure = base_name + "-structure" + extension # Distinct name for structure only
-                    output_path = output_path_structure
-
-                self.status_bar.showMessage(f"Saving single file: {os.path.basename(output_path)}")
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(full_content_to_write)
-
-
-                QMessageBox.information(self, "Success", f"Analysis complete. Output saved to:\n{output_path}")
-
-            # Report any non-critical errors during file reading
-            if errors:
-                error_details = "\n".join(errors[:10]) # Show first 10 errors
-                if len(errors) > 10:
-                    error_details += f"\n... and {len(errors) - 10} more."
-                QMessageBox.warning(self, "File Reading Issues", f"Some files could not be read properly or were skipped due to encoding issues:\n{error_details}")
-
-
-        except Exception as e:
-            import traceback
-            self.handle_error(f"An error occurred while saving the file(s):\n{traceback.format_exc()}")
-        finally:
-            # Set status back to Ready only if no error occurred during saving
-            if not self.status_bar.currentMessage().startswith("Processing failed"):
-                 self.status_bar.showMessage("Ready.")
-            # self.run_button.setEnabled(True) # Handled by signal connection
-
-    def split_content_smart(self, content, max_lines):
-        """Splits content into chunks, trying to keep files intact."""
-        self.update_status(f"Splitting content into chunks (max {max_lines} lines each)...")
-        if not content: return [] # Handle empty content to avoid split errors
-        lines = content.splitlines(keepends=True) # Keep newlines
-        if not lines: return []
-
-        parts = []
-        current_part_lines = []
-        current_line_count = 0
-        file_marker = ">>>File: "
-
-        # Find line indices of file markers
-        marker_indices = [-1] # Add dummy index for content before the first marker
-        marker_indices.extend([i for i, line in enumerate(lines) if line.startswith(file_marker)])
-
-        for i in range(len(marker_indices)):
-            start_index = marker_indices[i] + 1 # Start after the previous marker (or from beginning)
-            # If it's the *first* block (before any file marker), start_index will be 0
-            if i == 0 and start_index == 0 and marker_indices[0] == -1 : start_index = 0
-
-            # Find the end of the current block (start of the next marker or end of content)
-            end_index = marker_indices[i+1] if i + 1 < len(marker_indices) else len(lines)
-
-            block_lines = lines[start_index:end_index]
-            block_line_count = len(block_lines)
-
-            # Include the marker line itself in the block if it's not the first dummy marker
-            if i > 0:
-                marker_line_index = marker_indices[i]
-                block_lines.insert(0, lines[marker_line_index])
-                block_line_count += 1
-
-
-            if not block_lines: continue # Skip if block is somehow empty
-
-            # If the current block *itself* is larger than max_lines, it needs special handling
-            # For now, we just put it in its own chunk (or append if current chunk is empty)
-            if block_line_count > max_lines:
-                # If there's content in the current part, finalize it first
-                if current_part_lines:
-                    parts.append("".join(current_part_lines))
-                    current_part_lines = []
-                    current_line_count = 0
-
-                # Add the huge block as its own part (potentially oversized)
-                parts.append("".join(block_lines))
-                # Continue to next block, skipping normal append logic for this one
-                continue
-
-            # Check if adding this block exceeds the limit
-            if current_line_count > 0 and current_line_count + block_line_count > max_lines:
-                # Current block doesn't fit, finalize the previous part
-                parts.append("".join(current_part_lines))
-                current_part_lines = [] # Start new part
-                current_line_count = 0
-
-            # Add the current block to the current part
-            current_part_lines.extend(block_lines)
-            current_line_count += block_line_count
-
-        # Add the last remaining part
-        if current_part_lines:
-            parts.append("".join(current_part_lines))
-
-        self.update_status(f"Splitting complete. Generated {len(parts)} chunks.")
-        return parts
-
-    # Override closeEvent to stop the worker thread if running
-    def closeEvent(self, event):
-        if self.worker and self.worker.isRunning():
-            reply = QMessageBox.question(self, 'Confirm Exit',
-                                         "Processing is in progress. Are you sure you want to exit?",
-                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-            if reply == QMessageBox.Yes:
-                self.status_bar.showMessage("Attempting to stop worker thread...")
-                self.worker.terminate() # Request termination
-                if not self.worker.wait(2000): # Wait up to 2 seconds
-                     self.status_bar.showMessage("Worker did not stop gracefully. Forcing exit.")
-                else:
-                     self.status_bar.showMessage("Worker stopped.")
-                event.accept()
-            else:
-                event.ignore()
-        else:
-            event.accept()
-
 
 if __name__ == '__main__':
+    # Errors and warnings go to the console, debug output only with LOGLEVEL=DEBUG
+    log_level = logging.getLevelName(os.environ.get("LOGLEVEL", "WARNING").upper())
+    if not isinstance(log_level, int): # Unknown names come back as "Level ..." strings
+        log_level = logging.WARNING
+    logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
+
     # Enable High DPI scaling for better look on modern displays
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
@@ -2369,7 +2153,7 @@ if __name__ == '__main__':
         icon.addPixmap(pixmap)
         app.setWindowIcon(icon)
     except Exception as e:
-        print(f"Could not set application icon: {e}")
+        logger.warning("Could not set application icon: %s", e)
 
     # Create and show the main window
     main_window = CodeBaseAnalyzer()
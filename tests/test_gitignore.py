@@ -0,0 +1,86 @@
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'code-condenser.py')
+
+
+def load_condenser():
+    spec = importlib.util.spec_from_file_location('code_condenser', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@unittest.skipUnless(shutil.which('git'), "git is needed as the reference")
+class GitignoreMatchesGit(unittest.TestCase):
+    """The files ProcessWorker includes must be the ones git ls-files lists for the same .gitignore."""
+
+    PATTERNS = [
+        'src/gen/',       # Slash in the middle: anchored to the root
+        'docs/_build',
+        'foo/bar',
+        '**/logs',        # Leading **/: any depth
+        'src/**/*.py',    # /**/: zero or more directories
+        '/lib/*.js',      # * doesn't match /
+        '*.txt',
+        '!a/b/c.txt',     # Re-include an anchored path
+        '*.log',
+        '!keep.log',
+    ]
+
+    FILES = [
+        'src/gen/x.c', 'src/main.py', 'src/deep/er/m.py', 'src/readme.md',
+        'docs/_build/index.html', 'docs/index.md', 'other/docs/_build/kept.html',
+        'foo/bar', 'foo/baz.c', 'x/foo/bar',
+        'logs/r.c', 'x/y/logs/l.c',
+        'lib/a.js', 'lib/sub/b.js',
+        'a/b/c.txt', 'a/d.txt', 'notes.md',
+        'z.log', 'keep.log', 'sub/keep.log',
+    ]
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        for rel_path in self.FILES:
+            path = os.path.join(self.root, *rel_path.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write('x\n')
+        with open(os.path.join(self.root, '.gitignore'), 'w') as f:
+            f.write('\n'.join(self.PATTERNS) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        shutil.rmtree(self.output_dir)
+
+    def git_files(self):
+        subprocess.run(['git', 'init', '-q', self.root], check=True)
+        out = subprocess.run(['git', '-C', self.root, 'ls-files', '-co', '--exclude-standard', '-z'],
+                             check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+        return sorted(out.split('\0')[:-1])
+
+    def condenser_files(self):
+        condenser = load_condenser()
+        worker = condenser.ProcessWorker(self.root, {'.git'}, [], [], True, False, False,
+                                         os.path.join(self.output_dir, 'out.txt'))
+        errors = []
+        worker.error.connect(errors.append)
+        worker.run()
+        self.assertEqual(errors, [])
+        files = []
+        with open(worker.output_files[0], encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('>>>File: '):
+                    files.append(line[len('>>>File: '):].rstrip('\n'))
+        return sorted(files)
+
+    def test_included_files_match_git(self):
+        self.assertEqual(self.condenser_files(), self.git_files())
+
+
+if __name__ == '__main__':
+    unittest.main()